@@ -0,0 +1,61 @@
+"""Throughput and byte-for-byte correctness of one shared renderer used from many threads.
+
+Every thread renders the same job_data with the same logo in reproducible
+mode, so each output must equal a single-threaded reference render. Shared
+state that is not thread-safe (the cached logo's stream, pooled flowables)
+shows up as differing or truncated PDFs; the script exits with status 1 if
+any output differs. Threads are switched far more often than usual so
+races surface even on a single core.
+
+    python benchmarks/bench_concurrent_render.py --threads 8 --renders 1200
+"""
+import argparse
+import io
+import os
+import sys
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.fixtures import FIXTURE_SIZES, make_job_data
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--renders', type=int, default=400)
+    parser.add_argument('--size', default='small', choices=list(FIXTURE_SIZES))
+    parser.add_argument('--switch-interval', type=float, default=1e-5,
+                        help="sys.setswitchinterval while rendering; a short interval makes races show up on one core")
+    parser.add_argument('--logo', default=os.path.join(ROOT, 'logo.jpg'), help="Logo to draw; pass '' for none")
+    args = parser.parse_args()
+
+    warnings.simplefilter('ignore', FutureWarning)
+    from utils.pdf_generator import JobDescriptionRenderer
+
+    data = make_job_data(args.size)
+    logo_path = args.logo or None
+    renderer = JobDescriptionRenderer(reproducible=True)
+    reference = renderer.render_bytes(data, logo_path)
+
+    def render(_):
+        buffer = io.BytesIO()
+        renderer.render(buffer, data, logo_path)
+        return buffer.getvalue()
+
+    sys.setswitchinterval(args.switch_interval)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        outputs = list(pool.map(render, range(args.renders)))
+    elapsed = time.perf_counter() - start
+
+    mismatched = [output for output in outputs if output != reference]
+    print(f"{args.renders} renders on {args.threads} threads: {args.renders / elapsed:.1f} docs/s")
+    print(f"identical to reference: {args.renders - len(mismatched)}/{args.renders}"
+          + (f" (mismatched sizes {sorted({len(m) for m in mismatched})[:5]}, reference {len(reference)})" if mismatched else ''))
+    sys.exit(1 if mismatched else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Edit-to-preview latency and token cost: full regeneration vs section-level regeneration.
+
+For each edited key, the 'full' path asks the stub model for the whole job
+description and renders it with the section cache disabled, which is what an
+edit cost before; the 'edit' path calls regenerate_fields for that key alone
+and renders with a renderer whose cache holds only the original posting, so
+the changed section misses and is rebuilt while the others hit. The cache
+is cleared and the original rendered again, untimed, before every edit
+iteration. Token counts are the generator's estimates for the requests
+actually sent.
+
+    python benchmarks/bench_edit.py --size large --keys salary_range key_responsibilities --iterations 10
+"""
+import argparse
+import io
+import os
+import statistics
+import sys
+import time
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_gemini import FakeGeminiModel
+from benchmarks.fixtures import FIXTURE_SIZES, make_job_data
+
+def edited_value(value):
+    if isinstance(value, list):
+        return value[:-1] + ['Edited: ' + str(value[-1])] if value else ['Edited: item']
+    return f"{value} (edited)"
+
+def time_path(generate, renderer, iterations, prepare=None):
+    """Median seconds spent generating and rendering; prepare runs untimed before each iteration"""
+    generated, rendered = [], []
+    for _ in range(iterations):
+        if prepare is not None:
+            prepare()
+        start = time.perf_counter()
+        job_data = generate()
+        middle = time.perf_counter()
+        renderer.render(io.BytesIO(), job_data)
+        generated.append(middle - start)
+        rendered.append(time.perf_counter() - middle)
+    return statistics.median(generated), statistics.median(rendered)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', default='large', choices=list(FIXTURE_SIZES))
+    parser.add_argument('--keys', nargs='+', default=['salary_range', 'key_responsibilities', 'benefits'])
+    parser.add_argument('--iterations', type=int, default=10)
+    parser.add_argument('--llm-latency', type=float, default=0.0, help="Seconds the stub model waits per request")
+    args = parser.parse_args()
+
+    warnings.simplefilter('ignore', FutureWarning)
+    from utils.gemini_generator import GeminiGenerator
+    from utils.pdf_generator import JobDescriptionRenderer
+
+    data = make_job_data(args.size)
+    prompt = f"{data['job_title']} at {data['company_name']}, {data['location']}"
+    cold_renderer = JobDescriptionRenderer(use_section_cache=False)
+    warm_renderer = JobDescriptionRenderer()
+
+    def cache_original():
+        warm_renderer.section_cache.clear()
+        warm_renderer.render(io.BytesIO(), data)
+
+    for key in args.keys:
+        if key not in data:
+            print(f"{key:>22}: not in the {args.size} fixture, skipped")
+            continue
+        edited = dict(data, **{key: edited_value(data[key])})
+        full = GeminiGenerator('benchmark-key', model=FakeGeminiModel(body=edited, latency=args.llm_latency))
+        section = GeminiGenerator('benchmark-key', model=FakeGeminiModel(body={key: edited[key]}, latency=args.llm_latency))
+
+        full_generate, full_render = time_path(lambda: full.generate(prompt), cold_renderer, args.iterations)
+        edit_generate, edit_render = time_path(lambda: section.regenerate_fields(data, [key]), warm_renderer,
+                                               args.iterations, cache_original)
+
+        full_tokens = (full.stats['prompt_tokens'] + full.stats['output_tokens']) / full.stats['requests']
+        edit_tokens = (section.stats['prompt_tokens'] + section.stats['output_tokens']) / section.stats['requests']
+        full_total, edit_total = full_generate + full_render, edit_generate + edit_render
+        print(f"{key:>22}: full {full_total * 1000:8.1f}ms {full_tokens:7.0f} tokens  "
+              f"edit {edit_total * 1000:8.1f}ms {edit_tokens:7.0f} tokens  "
+              f"(render {full_render * 1000:.1f}ms -> {edit_render * 1000:.1f}ms)")
+
+if __name__ == "__main__":
+    main()
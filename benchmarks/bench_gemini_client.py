@@ -0,0 +1,75 @@
+"""Per-call overhead of generate_with_gemini: rebuilding the client vs reusing GeminiGenerator.
+
+The network call is replaced by a local fake that returns a canned JSON body, so
+the numbers only reflect SDK configuration, model construction, gRPC client
+creation, prompt building and response parsing.
+
+    python benchmarks/bench_gemini_client.py --calls 200
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import warnings
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+warnings.simplefilter('ignore', FutureWarning)
+
+import google.generativeai as genai
+from google.generativeai import client as genai_client
+
+from utils.gemini_generator import GeminiGenerator, build_enhanced_prompt, parse_response_text
+
+FAKE_RESPONSE = json.dumps({'job_title': 'Backend Engineer', 'company_name': 'Acme', 'key_responsibilities': ['Build: services'] * 6})
+
+def _fake_generate_content(self, contents, **kwargs):
+    # The real SDK creates its gRPC client lazily on the first request of each model
+    if self._client is None:
+        self._client = genai_client.get_default_generative_client()
+    return SimpleNamespace(text=f"```json\n{FAKE_RESPONSE}\n```")
+
+def legacy_generate(prompt, api_key):
+    """The pre-GeminiGenerator call path: configure and build a model on every call"""
+    genai.configure(api_key=api_key)
+    model = genai.GenerativeModel('gemini-1.5-flash')
+    response = model.generate_content(build_enhanced_prompt(prompt))
+    return parse_response_text(response.text)
+
+def _time_calls(fn, calls):
+    samples = []
+    for i in range(calls):
+        start = time.perf_counter()
+        fn(f"Backend engineer #{i} in Pune, 5 years Python")
+        samples.append(time.perf_counter() - start)
+    return samples
+
+def _summary(samples):
+    ordered = sorted(samples)
+    return {'mean_us': statistics.mean(ordered) * 1e6, 'p50_us': ordered[len(ordered) // 2] * 1e6,
+            'p95_us': ordered[int(len(ordered) * 0.95) - 1] * 1e6}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--calls', type=int, default=200)
+    args = parser.parse_args()
+
+    api_key = 'benchmark-key'
+    original = genai.GenerativeModel.generate_content
+    genai.GenerativeModel.generate_content = _fake_generate_content
+    try:
+        before = _summary(_time_calls(lambda p: legacy_generate(p, api_key), args.calls))
+        generator = GeminiGenerator(api_key)
+        generator.generate('warm-up')
+        after = _summary(_time_calls(generator.generate, args.calls))
+    finally:
+        genai.GenerativeModel.generate_content = original
+
+    for label, stats in (('per-call setup', before), ('GeminiGenerator', after)):
+        print(f"{label:>16}: mean {stats['mean_us']:8.1f}us  p50 {stats['p50_us']:8.1f}us  p95 {stats['p95_us']:8.1f}us")
+    print(f"{'speedup':>16}: {before['mean_us'] / after['mean_us']:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""CLI start-up cost measured with ``python -X importtime``.
+
+Each scenario runs in a fresh interpreter; the cumulative import time of
+every top-level module is summed from the -X importtime report and the
+slowest imports are listed. 'eager imports' reproduces what main.py used to
+import at load time (the Gemini SDK and the whole ReportLab stack), 'main'
+is the current lazy startup, and 'render-only' runs a complete
+``main.py --render-only`` and checks that the Gemini SDK never loaded.
+
+    python benchmarks/bench_import_time.py --runs 5 --top 8
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.fixtures import SAMPLE_JOB_DATA
+
+EAGER_IMPORTS = ('import dotenv, utils.pdf_generator, utils.gemini_generator, utils.batch_processor, '
+                 'utils.response_cache, google.generativeai')
+
+def parse_importtime(stderr):
+    """Return {module: cumulative_us} for top-level imports from -X importtime output"""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Nested imports are indented under their parent; only top-level entries add up to the total
+        if not name.startswith('  ', 1):
+            modules[name.strip()] = int(cumulative)
+    return modules
+
+def run_scenario(argv, runs):
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        completed = subprocess.run([sys.executable, '-X', 'importtime', *argv], cwd=ROOT, capture_output=True, text=True,
+                                   input='', env={**os.environ, 'PYTHONWARNINGS': 'ignore'})
+        wall = time.perf_counter() - start
+        modules = parse_importtime(completed.stderr)
+        total = sum(modules.values())
+        if best is None or total < best['import_us']:
+            best = {'import_us': total, 'wall_s': wall, 'modules': modules, 'stdout': completed.stdout}
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=3, help="Fresh interpreters per scenario; the fastest is kept")
+    parser.add_argument('--top', type=int, default=5, help="Slowest top-level imports to list per scenario")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        job_path = os.path.join(tmp, 'job.json')
+        with open(job_path, 'w', encoding='utf-8') as f:
+            json.dump(SAMPLE_JOB_DATA, f)
+        check_sdk = "import sys; print('gemini sdk loaded:', 'google.generativeai' in sys.modules)"
+        scenarios = {
+            'eager imports': ['-c', EAGER_IMPORTS],
+            'main': ['-c', 'import main'],
+            'render-only': ['-c', f"import sys; sys.argv = ['main.py', '--render-only', {job_path!r}]; "
+                                  f"import main; main.main(); {check_sdk}"],
+        }
+        for name, argv in scenarios.items():
+            result = run_scenario(argv, args.runs)
+            print(f"{name:>14}: imports {result['import_us'] / 1000:8.1f}ms  wall {result['wall_s'] * 1000:8.1f}ms")
+            for module, cumulative in sorted(result['modules'].items(), key=lambda item: -item[1])[:args.top]:
+                print(f"{'':>16}{cumulative / 1000:8.1f}ms  {module}")
+            for line in result['stdout'].splitlines():
+                if line.startswith('gemini sdk loaded'):
+                    print(f"{'':>16}{line}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Cost of each output format rendered from one normalized JobDocument.
+
+normalize_job_data runs once per document and every renderer walks the
+resulting tree, so asking for several formats adds only each renderer's
+own cost. Rates are the best of --rounds and cover every fixture size.
+Each format renders the same document over and over, so the shared PDF
+renderer's section cache is turned off and pdf times a first render.
+
+    python benchmarks/bench_output_formats.py --docs 20 --rounds 3
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fixtures import FIXTURE_SIZES, make_job_data
+from utils.document_model import normalize_job_data
+from utils.output_formats import RENDERERS, render_formats
+from utils.pdf_generator import get_renderer
+
+def _best_ms(fn, docs, rounds):
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(docs):
+            fn()
+        elapsed = (time.perf_counter() - start) / docs * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--docs', type=int, default=20)
+    parser.add_argument('--rounds', type=int, default=3)
+    args = parser.parse_args()
+
+    get_renderer().section_cache = None
+    for size in FIXTURE_SIZES:
+        data = make_job_data(size)
+        document = normalize_job_data(data)
+        render_formats(document, list(RENDERERS))  # warm up fonts and imports
+        timings = {'normalize': _best_ms(lambda: normalize_job_data(data), args.docs, args.rounds)}
+        for name, renderer in RENDERERS.items():
+            timings[name] = _best_ms(lambda: renderer.render(document), args.docs, args.rounds)
+        timings['all formats'] = _best_ms(lambda: render_formats(data, list(RENDERERS)), args.docs, args.rounds)
+
+        print(f"{size}:")
+        for name, ms in timings.items():
+            ratio = f"  {timings['pdf'] / ms:8.0f}x faster than pdf" if name in RENDERERS and name != 'pdf' else ''
+            print(f"  {name:>12}: {ms:9.3f} ms{ratio}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Documents per second for per-document style construction vs a shared JobDescriptionRenderer.
+
+Both of those renderers run with the section cache off, so every document
+builds its paragraphs and the gap between them is style construction
+alone. A third row renders the same posting again through a shared
+renderer's section cache, which is what a repeat posting costs.
+
+    python benchmarks/bench_pdf_renderer.py --docs 50 --rounds 3
+"""
+import argparse
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fixtures import SAMPLE_JOB_DATA
+from utils.pdf_generator import JobDescriptionRenderer
+
+def _docs_per_second(render, docs):
+    start = time.perf_counter()
+    for _ in range(docs):
+        render(io.BytesIO(), SAMPLE_JOB_DATA, None)
+    return docs / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--docs', type=int, default=50)
+    parser.add_argument('--rounds', type=int, default=3)
+    args = parser.parse_args()
+
+    renderer = JobDescriptionRenderer(use_section_cache=False)
+    cached_renderer = JobDescriptionRenderer()
+    # A fresh renderer per document reproduces the old setup_pdf_styles()-per-call cost
+    candidates = {
+        'per-document styles': lambda out, data, logo: JobDescriptionRenderer(use_section_cache=False).render(out, data, logo),
+        'shared renderer': renderer.render,
+        'repeat, cached': cached_renderer.render,
+    }
+    _docs_per_second(renderer.render, 3)  # warm up fonts and imports
+    _docs_per_second(cached_renderer.render, 1)
+    best = {name: 0.0 for name in candidates}
+    for _ in range(args.rounds):
+        for name, render in candidates.items():
+            best[name] = max(best[name], _docs_per_second(render, args.docs))
+
+    start = time.perf_counter()
+    for _ in range(args.docs):
+        JobDescriptionRenderer(use_section_cache=False)
+    style_ms = (time.perf_counter() - start) / args.docs * 1000
+
+    for name, rate in best.items():
+        print(f"{name:>20}: {rate:7.1f} docs/s (best of {args.rounds})")
+    saved_ms = (1 / best['per-document styles'] - 1 / best['shared renderer']) * 1000
+    print(f"{'shared renderer':>20}: {saved_ms:7.3f} ms per document saved, of which {style_ms:.3f} ms is constructing styles")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""Per-stage latency, throughput and memory of the generate-and-render path.
+
+Gemini is replaced by FakeGeminiModel, a deterministic local stub whose
+latency is set with --llm-latency, and documents come from make_job_data in
+small, medium and large sizes. Each stage and size runs in its own spawned
+process so its peak RSS is not inflated by the stages before it:
+
+    generate   GeminiGenerator.generate: prompt building, streaming parse, repair
+    build      build_job_content: flowable construction
+    measure    estimate_layout: fit measurement
+    optimize   optimize_content_spacing: one spacing pass
+    doc_build  SimpleDocTemplate.build into memory
+    render     JobDescriptionRenderer.render end to end
+    pipeline   generate followed by render
+
+Every iteration renders the same posting, so render and pipeline run with
+the section cache off and time a first render; --section-cache times
+repeat renders served from it instead.
+
+Results (p50/p95/mean latency, docs/s, peak RSS) are written as JSON; pass an
+earlier results file with --compare to print p50 changes. --profile DIR dumps
+one cProfile file per stage and size, which snakeviz or flameprof turn into
+flame graphs; profiling slows every stage, so keep those runs out of comparisons.
+
+    python benchmarks/bench_pipeline.py --iterations 30 --output results.json
+    python benchmarks/bench_pipeline.py --stages render --sizes large --profile prof/
+"""
+import argparse
+import cProfile
+import io
+import json
+import multiprocessing as mp
+import os
+import platform
+import resource
+import sys
+import time
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fixtures import FIXTURE_SIZES, make_job_data
+
+STAGES = ['generate', 'build', 'measure', 'optimize', 'doc_build', 'render', 'pipeline']
+
+def _peak_rss_mb():
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def _stage_fn(stage, data, llm_latency, section_cache):
+    """Return a zero-argument callable that runs one iteration of the stage and reports its own duration"""
+    warnings.simplefilter('ignore', FutureWarning)
+    from reportlab.platypus import SimpleDocTemplate
+    from benchmarks.fake_gemini import FakeGeminiModel
+    from utils.gemini_generator import GeminiGenerator
+    from utils.pdf_generator import (FRAME_PADDING, JobDescriptionRenderer, build_job_content, estimate_layout,
+                                     optimize_content_spacing)
+
+    renderer = JobDescriptionRenderer(use_section_cache=section_cache)
+    generator = GeminiGenerator('benchmark-key', model=FakeGeminiModel(body=data, latency=llm_latency))
+    prompt = f"{data['job_title']} at {data['company_name']}, {data['location']}"
+
+    def new_doc():
+        return SimpleDocTemplate(io.BytesIO(), pagesize=renderer.pagesize, **renderer.margins)
+
+    def timed(fn, *args):
+        start = time.perf_counter()
+        fn(*args)
+        return time.perf_counter() - start
+
+    def measure():
+        content, doc = build_job_content(data, renderer.styles), new_doc()
+        return timed(estimate_layout, content, doc.width - 2 * FRAME_PADDING)
+
+    def optimize():
+        content = build_job_content(data, renderer.styles)
+        return timed(optimize_content_spacing, content, 0.2)
+
+    def doc_build():
+        content, doc = build_job_content(data, renderer.styles), new_doc()
+        estimate_layout(content, doc.width - 2 * FRAME_PADDING)
+        return timed(doc.build, content)
+
+    def pipeline():
+        start = time.perf_counter()
+        renderer.render(io.BytesIO(), generator.generate(prompt))
+        return time.perf_counter() - start
+
+    return {
+        'generate': lambda: timed(generator.generate, prompt),
+        'build': lambda: timed(build_job_content, data, renderer.styles),
+        'measure': measure,
+        'optimize': optimize,
+        'doc_build': doc_build,
+        'render': lambda: timed(renderer.render, io.BytesIO(), data),
+        'pipeline': pipeline,
+    }[stage]
+
+def _run_stage(stage, size, iterations, warmup, llm_latency, section_cache, profile_dir):
+    run_once = _stage_fn(stage, make_job_data(size), llm_latency, section_cache)
+    for _ in range(warmup):
+        run_once()
+    baseline_rss = _peak_rss_mb()
+
+    profiler = cProfile.Profile() if profile_dir else None
+    samples = []
+    if profiler:
+        profiler.enable()
+    for _ in range(iterations):
+        samples.append(run_once())
+    if profiler:
+        profiler.disable()
+        profiler.dump_stats(os.path.join(profile_dir, f"{stage}-{size}.prof"))
+
+    samples.sort()
+    mean = sum(samples) / len(samples)
+    return {
+        'stage': stage, 'size': size, 'iterations': iterations,
+        'p50_ms': round(samples[len(samples) // 2] * 1000, 3),
+        'p95_ms': round(samples[max(0, int(len(samples) * 0.95) - 1)] * 1000, 3),
+        'mean_ms': round(mean * 1000, 3),
+        # Per-iteration setup (fresh flowables for measure, optimize and doc_build) is excluded
+        'docs_per_second': round(1 / mean, 2),
+        'baseline_rss_mb': round(baseline_rss, 1),
+        'peak_rss_mb': round(_peak_rss_mb(), 1),
+    }
+
+def run_isolated(*args):
+    """Run one stage in a fresh spawned process so peak RSS reflects that stage alone"""
+    with mp.get_context('spawn').Pool(1) as pool:
+        return pool.apply(_run_stage, args)
+
+def compare(results, previous_path):
+    with open(previous_path, 'r', encoding='utf-8') as f:
+        previous = {(r['stage'], r['size']): r for r in json.load(f)['results']}
+    print(f"\nChange in p50 vs {previous_path}:")
+    for result in results:
+        before = previous.get((result['stage'], result['size']))
+        if before and before['p50_ms']:
+            change = (result['p50_ms'] - before['p50_ms']) / before['p50_ms'] * 100
+            print(f"{result['stage']:>10} {result['size']:>6}: {before['p50_ms']:9.3f}ms -> {result['p50_ms']:9.3f}ms ({change:+6.1f}%)")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--stages', nargs='+', default=STAGES, choices=STAGES)
+    parser.add_argument('--sizes', nargs='+', default=list(FIXTURE_SIZES), choices=list(FIXTURE_SIZES))
+    parser.add_argument('--iterations', type=int, default=30)
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument('--llm-latency', type=float, default=0.0, help="Seconds the stub model waits per request")
+    parser.add_argument('--section-cache', action='store_true',
+                        help="Keep the renderer's section cache on, timing repeat renders of one posting")
+    parser.add_argument('--profile', metavar='DIR', help="Write a cProfile file per stage and size into DIR")
+    parser.add_argument('--output', default='bench_pipeline.json', help="Results file (default: bench_pipeline.json)")
+    parser.add_argument('--compare', metavar='JSON', help="Earlier results file to compare p50 latencies against")
+    args = parser.parse_args()
+
+    if args.profile:
+        os.makedirs(args.profile, exist_ok=True)
+    results = []
+    for stage in args.stages:
+        for size in args.sizes:
+            result = run_isolated(stage, size, args.iterations, args.warmup, args.llm_latency, args.section_cache,
+                                  args.profile)
+            results.append(result)
+            print(f"{stage:>10} {size:>6}: p50 {result['p50_ms']:9.3f}ms  p95 {result['p95_ms']:9.3f}ms  "
+                  f"{result['docs_per_second']:9.1f} docs/s  peak RSS {result['peak_rss_mb']:6.1f}MB")
+
+    report = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'settings': {'iterations': args.iterations, 'warmup': args.warmup, 'llm_latency': args.llm_latency,
+                     'section_cache': args.section_cache, 'profiled': bool(args.profile)},
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {args.output}")
+    if args.compare:
+        compare(results, args.compare)
+
+if __name__ == "__main__":
+    main()
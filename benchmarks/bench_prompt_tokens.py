@@ -0,0 +1,49 @@
+"""Input size of the compiled prompt: static prefix vs per-request content.
+
+Token counts are estimated locally; pass --count-with-api (needs GEMINI_API_KEY)
+to have Gemini count them instead.
+
+    python benchmarks/bench_prompt_tokens.py
+"""
+import argparse
+import os
+import sys
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+warnings.simplefilter('ignore', FutureWarning)
+
+from utils.prompt_builder import default_prompt_builder, detect_industry, estimate_tokens
+
+SAMPLE_PROMPTS = [
+    "Senior Python backend engineer at Acme Analytics, Pune, 6+ years, 30-40 LPA, hybrid",
+    "ICU staff nurse for a 300-bed city hospital, night shifts, BSc Nursing required",
+    "CNC machinist for an automotive parts plant, 2 years experience, rotating shifts",
+    "High school mathematics teacher, CBSE curriculum, Monday to Saturday",
+    "Operations coordinator, 3 years experience",
+]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count-with-api', action='store_true')
+    args = parser.parse_args()
+
+    count = estimate_tokens
+    if args.count_with_api:
+        import google.generativeai as genai
+        from utils.gemini_generator import resolve_api_key
+        genai.configure(api_key=resolve_api_key())
+        model = genai.GenerativeModel('gemini-1.5-flash')
+        count = lambda text: model.count_tokens(text).total_tokens
+
+    builder = default_prompt_builder
+    system_tokens = count(builder.system_instruction)
+    print(f"static prefix: {len(builder.system_instruction)} chars, {system_tokens} tokens (system instruction)")
+    for prompt in SAMPLE_PROMPTS:
+        content = builder.user_content(prompt)
+        content_tokens = count(content)
+        print(f"{str(detect_industry(prompt)):>18}: per-request {content_tokens:4d} tokens, "
+              f"with prefix {system_tokens + content_tokens:5d} tokens")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""RenderFarm throughput for increasing worker counts.
+
+    python benchmarks/bench_render_farm.py --docs 2000 --workers 1 2 4 8
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fixtures import SAMPLE_JOB_DATA
+from utils.render_farm import RenderFarm
+
+LOGO_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'logo.jpg')
+
+def run(workers, docs, output_dir):
+    with RenderFarm(workers=workers, preload_logo_path=LOGO_PATH) as farm:
+        # Let every worker finish its warm-up so start-up cost is not counted
+        for i in range(workers):
+            farm.submit(os.path.join(output_dir, f"warm-{i}.pdf"), SAMPLE_JOB_DATA, LOGO_PATH)
+        farm.join()
+        list(farm.results())
+
+        start = time.perf_counter()
+        for i in range(docs):
+            farm.submit(os.path.join(output_dir, f"{i % 64}.pdf"), SAMPLE_JOB_DATA, LOGO_PATH)
+        failures = sum(1 for result in farm.results() if result['status'] != 'ok')
+        elapsed = time.perf_counter() - start
+    return docs / elapsed, failures
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--docs', type=int, default=500)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    baseline = None
+    with tempfile.TemporaryDirectory() as output_dir:
+        for workers in sorted(set(args.workers)):
+            rate, failures = run(workers, args.docs, output_dir)
+            baseline = baseline or rate
+            print(f"{workers:>3} workers: {rate:7.1f} docs/s  scaling {rate / baseline:5.2f}x  failures {failures}")
+
+if __name__ == "__main__":
+    main()
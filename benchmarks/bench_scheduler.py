@@ -0,0 +1,95 @@
+"""RequestScheduler behaviour against a fake Gemini backend that injects errors and latency.
+
+Each scenario pushes the same number of concurrent generate() calls through a
+GeminiGenerator backed by FakeGeminiModel and reports completed calls, p50/p95
+latency and the scheduler's retry, hedge and failover counts, plus the most
+streams any model had open at once. That peak must stay within the per-model
+concurrency cap, since a stream holds its slot until it is read to the end;
+the script exits with status 1 if it does not. Backoff delays are scaled
+down so the run finishes in seconds.
+
+    python benchmarks/bench_scheduler.py --calls 200 --concurrency 16
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_gemini import FakeGeminiModel
+from utils.gemini_generator import GeminiGenerator
+from utils.request_scheduler import RequestScheduler
+
+class FakeBackedGenerator(GeminiGenerator):
+    def __init__(self, models, scheduler):
+        super().__init__('benchmark-key', model_names=scheduler.model_names, scheduler=scheduler)
+        self._fakes = models
+
+    def _create_model(self, model_name):
+        return self._fakes[model_name]
+
+SCENARIOS = {
+    # 30% of requests are rejected with 429; no retries vs jittered backoff
+    'rate-limited, no retries': (lambda: {'primary': FakeGeminiModel(latency=0.02, error_rate=0.3, seed=1)},
+                                 dict(max_attempts=1)),
+    'rate-limited, backoff': (lambda: {'primary': FakeGeminiModel(latency=0.02, error_rate=0.3, seed=1)},
+                              dict(max_attempts=5, base_delay=0.01, max_delay=0.2)),
+    # 5% of requests stall for 0.5s; hedging after 0.1s cuts the tail
+    'slow tail, no hedging': (lambda: {'primary': FakeGeminiModel(latency=0.02, slow_rate=0.05, slow_latency=0.5, seed=2)},
+                              dict()),
+    'slow tail, hedged': (lambda: {'primary': FakeGeminiModel(latency=0.02, slow_rate=0.05, slow_latency=0.5, seed=2)},
+                          dict(hedge_after=0.1)),
+    # The first model is unavailable; requests fail over to the second
+    'failover': (lambda: {'primary': FakeGeminiModel(unavailable=True), 'fallback': FakeGeminiModel(latency=0.02, seed=3)},
+                 dict()),
+    # Pacing at 600 requests per minute instead of bursting
+    'paced at 600 rpm': (lambda: {'primary': FakeGeminiModel(latency=0.02, seed=4)}, dict(requests_per_minute=600)),
+    # Slow streams under a cap of 2: at most 2 may be open at once, however many callers wait
+    'slow streams, cap 2': (lambda: {'primary': FakeGeminiModel(latency=0.005, chunks=8, chunk_latency=0.01, seed=5)},
+                            dict(max_concurrency_per_model=2)),
+}
+
+def run(name, calls, concurrency, model_concurrency):
+    make_models, options = SCENARIOS[name]
+    models = make_models()
+    options = {'max_concurrency_per_model': model_concurrency, **options}
+    scheduler = RequestScheduler(list(models), **options)
+    generator = FakeBackedGenerator(models, scheduler)
+
+    def call(i):
+        start = time.perf_counter()
+        try:
+            generator.generate(f"Backend engineer #{i} in Pune, 5 years Python")
+            return time.perf_counter() - start
+        except Exception:
+            return None
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        samples = list(pool.map(call, range(calls)))
+    elapsed = time.perf_counter() - start
+    scheduler.close()
+    latencies = sorted(sample for sample in samples if sample is not None)
+    p50 = latencies[len(latencies) // 2] * 1000 if latencies else 0.0
+    p95 = latencies[max(0, int(len(latencies) * 0.95) - 1)] * 1000 if latencies else 0.0
+    stats = scheduler.stats
+    peak_streams = max(model.peak_streams for model in models.values())
+    print(f"{name:>26}: ok {len(latencies):4d}/{calls}  p50 {p50:7.1f}ms  p95 {p95:7.1f}ms  {elapsed:6.2f}s  "
+          f"retries {stats['retries']:4d}  hedges {stats['hedges']:3d} (won {stats['hedge_wins']:3d})  "
+          f"failovers {stats['failovers']:4d}  peak streams {peak_streams:3d}/{options['max_concurrency_per_model']}")
+    return peak_streams <= options['max_concurrency_per_model']
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--calls', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--model-concurrency', type=int, default=24)
+    parser.add_argument('--scenarios', nargs='+', default=list(SCENARIOS), choices=list(SCENARIOS))
+    args = parser.parse_args()
+    within_cap = [run(name, args.calls, args.concurrency, args.model_concurrency) for name in args.scenarios]
+    sys.exit(0 if all(within_cap) else 1)
+
+if __name__ == "__main__":
+    main()
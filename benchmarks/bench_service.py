@@ -0,0 +1,113 @@
+"""Load test for the HTTP service against the stub model.
+
+The service is started in-process on a free port with a GeminiGenerator
+backed by FakeGeminiModel, then --requests requests are sent from
+--concurrency concurrent clients. Prompts are drawn from --distinct
+different prompts, so with a small pool most requests arrive while an
+identical one is in flight and are coalesced; the report compares upstream
+model calls with requests. A ticker on the event loop records the worst
+scheduling lag, which stays near zero only while rendering is kept off the
+loop. --timeout below --llm-latency exercises the 504 path.
+
+    python benchmarks/bench_service.py --route generate-render --requests 200 --concurrency 32 --distinct 8
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_gemini import FakeGeminiModel
+from benchmarks.fixtures import FIXTURE_SIZES, make_job_data
+
+ROUTES = ['generate', 'render', 'generate-render']
+
+async def post(port, path, payload):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    body = json.dumps(payload).encode('utf-8')
+    writer.write(f"POST {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode('latin-1') + body)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    return int(response.split(b' ', 2)[1]), len(response)
+
+async def loop_lag(stop, interval=0.005):
+    """Worst delay between when a sleep should have ended and when the loop got to it"""
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - start - interval)
+    return worst
+
+async def run(args):
+    from utils.gemini_generator import GeminiGenerator
+    from utils.http_service import JobDescriptionService
+
+    data = make_job_data(args.size)
+    model = FakeGeminiModel(body=data, latency=args.llm_latency, jitter=args.llm_latency / 4)
+    generator = GeminiGenerator('benchmark-key', model=model)
+    service = JobDescriptionService(generator, request_timeout=args.timeout, render_workers=args.render_workers,
+                                    render_processes=args.render_processes)
+    server = await service.start('127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+
+    def payload(i):
+        prompt = f"{data['job_title']} #{i % args.distinct} at {data['company_name']}"
+        if args.route == 'render':
+            return {'job_data': dict(data, job_title=prompt), 'format': args.format}
+        return {'prompt': prompt, 'format': args.format}
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies, statuses = [], {}
+
+    async def one(i):
+        async with semaphore:
+            start = time.perf_counter()
+            status, _ = await post(port, f"/{args.route}", payload(i))
+            latencies.append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    stop = asyncio.Event()
+    ticker = asyncio.ensure_future(loop_lag(stop))
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(args.requests)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    worst_lag = await ticker
+    server.close()
+    await server.wait_closed()
+    service.close()
+
+    latencies.sort()
+    print(f"route /{args.route}, {args.requests} requests, concurrency {args.concurrency}, {args.distinct} distinct prompts")
+    print(f"  throughput  {args.requests / elapsed:8.1f} req/s")
+    print(f"  latency     p50 {latencies[len(latencies) // 2] * 1000:8.1f}ms  "
+          f"p95 {latencies[max(0, int(len(latencies) * 0.95) - 1)] * 1000:8.1f}ms")
+    print(f"  statuses    {dict(sorted(statuses.items()))}")
+    print(f"  upstream    {model.calls} model calls, {service.flights.coalesced} generate and render calls coalesced")
+    print(f"  loop lag    worst {worst_lag * 1000:.1f}ms")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--route', default='generate-render', choices=ROUTES)
+    parser.add_argument('--format', default='pdf', choices=['pdf', 'html', 'markdown', 'text'])
+    parser.add_argument('--size', default='medium', choices=list(FIXTURE_SIZES))
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--distinct', type=int, default=8, help="Different prompts the requests are drawn from")
+    parser.add_argument('--llm-latency', type=float, default=0.5, help="Seconds the stub model waits per request")
+    parser.add_argument('--timeout', type=float, default=30.0, help="Service request timeout in seconds")
+    parser.add_argument('--render-workers', type=int, default=2)
+    parser.add_argument('--render-processes', type=int, default=0)
+    args = parser.parse_args()
+    warnings.simplefilter('ignore', FutureWarning)
+    asyncio.run(run(args))
+
+if __name__ == "__main__":
+    main()
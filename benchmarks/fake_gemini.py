@@ -0,0 +1,106 @@
+"""Local stand-in for a Gemini model that injects latency and API errors.
+
+FakeGeminiModel exposes the generate_content surface GeminiGenerator uses,
+streamed or not, and is deterministic for a given seed so scheduler and
+pipeline runs can be replayed without network access or quota.
+"""
+import json
+import random
+import threading
+import time
+from types import SimpleNamespace
+
+DEFAULT_BODY = {'job_title': 'Backend Engineer', 'company_name': 'Acme', 'location': 'Pune',
+                'key_responsibilities': ['Build: services'] * 6, 'technical_requirements': ['Python: 5 years'] * 4}
+
+class FakeApiError(Exception):
+    """Error shaped like google.api_core exceptions, which carry the HTTP status as ``code``"""
+
+    def __init__(self, code, message=''):
+        super().__init__(message or f"fake API error {code}")
+        self.code = code
+
+class FakeStream:
+    """Streamed response that stays open, chunk by chunk, until it is consumed or closed"""
+
+    def __init__(self, chunks, chunk_latency, sleep, on_close):
+        self._chunks = iter(chunks)
+        self._chunk_latency = chunk_latency
+        self._sleep = sleep
+        self._on_close = on_close
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            chunk = next(self._chunks)
+        except StopIteration:
+            self.close()
+            raise
+        if self._chunk_latency:
+            self._sleep(self._chunk_latency)
+        return chunk
+
+    def close(self):
+        on_close, self._on_close = self._on_close, None
+        if on_close is not None:
+            on_close()
+
+class FakeGeminiModel:
+    """Deterministic fake model.
+
+    Each request sleeps ``latency`` seconds (plus up to ``jitter``, and
+    ``slow_latency`` instead for a ``slow_rate`` share of requests) and
+    fails with ``error_code`` for an ``error_rate`` share of requests.
+    Streamed responses are split into ``chunks`` pieces, each taking
+    ``chunk_latency`` seconds to arrive; ``peak_streams`` records the most
+    streams open at once. ``unavailable`` makes every request fail with 404,
+    as the API does for unknown models.
+    """
+
+    def __init__(self, body=None, latency=0.0, jitter=0.0, error_rate=0.0, error_code=429, slow_rate=0.0,
+                 slow_latency=0.0, chunks=4, chunk_latency=0.0, unavailable=False, seed=0, sleep=time.sleep):
+        self.text = json.dumps(body or DEFAULT_BODY)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_code = error_code
+        self.slow_rate = slow_rate
+        self.slow_latency = slow_latency
+        self.chunks = max(1, chunks)
+        self.chunk_latency = chunk_latency
+        self.open_streams = 0
+        self.peak_streams = 0
+        self.unavailable = unavailable
+        self.calls = 0
+        self._random = random.Random(seed)
+        self._sleep = sleep
+        self._lock = threading.Lock()
+
+    def _draw(self):
+        with self._lock:
+            self.calls += 1
+            return self._random.random(), self._random.random(), self._random.random()
+
+    def generate_content(self, contents, stream=False, **kwargs):
+        fail, slow, jitter = self._draw()
+        delay = (self.slow_latency if slow < self.slow_rate else self.latency) + jitter * self.jitter
+        if delay:
+            self._sleep(delay)
+        if self.unavailable:
+            raise FakeApiError(404, "model not found")
+        if fail < self.error_rate:
+            raise FakeApiError(self.error_code)
+        if not stream:
+            return SimpleNamespace(text=self.text, usage_metadata=None)
+        size = -(-len(self.text) // self.chunks)
+        chunks = [SimpleNamespace(text=self.text[i:i + size], usage_metadata=None) for i in range(0, len(self.text), size)]
+        with self._lock:
+            self.open_streams += 1
+            self.peak_streams = max(self.peak_streams, self.open_streams)
+        return FakeStream(chunks, self.chunk_latency, self._sleep, self._stream_closed)
+
+    def _stream_closed(self):
+        with self._lock:
+            self.open_streams -= 1
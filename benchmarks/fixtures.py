@@ -0,0 +1,126 @@
+"""Shared job_data fixtures for the benchmark scripts."""
+import random
+
+SAMPLE_JOB_DATA = {
+    'company_name': 'Acme Analytics',
+    'job_title': 'Senior Backend Engineer',
+    'location': 'Pune, India',
+    'team': 'Platform',
+    'reporting_to': 'Engineering Manager',
+    'employment_type': 'Full-time',
+    'experience_required': 'Senior Level',
+    'salary_range': '30-40 LPA',
+    'office_timings': '10:00 AM - 7:00 PM',
+    'working_days': 'Monday to Friday',
+    'industry_type': 'IT/Technology',
+    'company_overview': 'Acme Analytics builds data tooling for mid-sized retailers, helping them forecast demand, '
+                        'manage inventory and understand customer behaviour across online and offline channels.',
+    'role_overview': 'As a Senior Backend Engineer you will design, build and operate the services that ingest and '
+                     'process millions of retail events every day. You will own critical APIs end to end, mentor '
+                     'engineers, and partner with product and data science to turn ambiguous problems into reliable, '
+                     'observable systems that scale with our customers.',
+    'salary_range_note': '',
+    'key_responsibilities': [
+        'Primary Role Focus: Design, implement and maintain high-throughput Python services and APIs that power '
+        'forecasting and inventory products, with clear ownership of correctness, latency and cost.',
+        'Data Pipelines: Build and tune streaming and batch pipelines that move retail events into our warehouse, '
+        'ensuring schemas evolve safely and data arrives on time.',
+        'Quality & Standards Compliance: Maintain high test coverage, participate in code review, and follow security '
+        'and privacy practices required by enterprise customers.',
+        'Project Management: Break down large initiatives into milestones, track progress and communicate risks early '
+        'to stakeholders across engineering and product.',
+        'Documentation & Reporting: Keep design documents, runbooks and API references current so other teams can '
+        'integrate and operate services without hand-holding.',
+        'Team Collaboration: Work with product managers, data scientists and support engineers to prioritise work '
+        'and resolve customer-facing incidents quickly.',
+    ],
+    'technical_requirements': {
+        'must_have_skills': [
+            'Python: Expert-level Python including asyncio, packaging, profiling and performance tuning in production.',
+            'Databases: Strong PostgreSQL skills covering schema design, indexing, query planning and migrations.',
+            'Cloud: Hands-on experience deploying and operating services on AWS or GCP using infrastructure as code.',
+        ],
+        'nice_to_have_skills': [
+            'Streaming: Familiarity with Kafka or Kinesis and exactly-once processing patterns.',
+        ],
+    },
+    'who_you_are': [
+        'Professional Excellence: You take ownership, follow through on commitments and hold a high bar for quality.',
+        'Industry Expertise: You keep learning, bring ideas from the wider ecosystem and adapt them pragmatically.',
+        'Communication Skills: You explain trade-offs clearly to engineers and non-engineers alike.',
+        'Problem-Solving Mindset: You debug methodically and prefer simple, measurable solutions.',
+    ],
+    'experience_skills': [
+        'Professional Experience: Six or more years building backend systems, including at least two years leading '
+        'the design of services that run at significant scale.',
+        'Industry Expertise: Experience with analytics or retail data is a plus.',
+        'Functional Knowledge: Comfortable across the stack from API design to on-call operations.',
+    ],
+    'qualifications': [
+        'Educational Background: Bachelor\'s degree in Computer Science or equivalent practical experience.',
+        'Professional Experience: Proven track record shipping and operating production services.',
+        'Industry-Specific Requirements: No specific certifications required.',
+    ],
+    'preferred_qualifications': [
+        'Advanced Technology Skills: Experience with distributed tracing and capacity planning.',
+        'Professional Certifications: Cloud certifications are welcome but not required.',
+        'Leadership Experience: Experience mentoring engineers or leading a small team.',
+    ],
+    'what_we_offer': [
+        'Career Growth Opportunities: Clear promotion paths, a learning budget and regular technical talks.',
+        'Modern Work Environment: A collaborative, low-ego culture with modern tooling and hardware.',
+        'Competitive Compensation: Market-leading salary with annual performance bonuses.',
+        'Work-Life Balance: Flexible hours, generous leave and wellness days.',
+        'Professional Development: Conference budget and sponsored certifications.',
+    ],
+    'benefits': [
+        'Health & Wellness Coverage: Comprehensive medical insurance for you and your family.',
+        'Learning & Development Support: Annual allowance for courses, books and certifications.',
+        'Hybrid Work: Three office days a week with home-office equipment support.',
+        'Allowances: Internet and meal allowances.',
+        'Team Culture & Engagement: Quarterly off-sites, hackathons and recognition programs.',
+    ],
+    'application_process': 'Applications are reviewed within a week, followed by a recruiter screen, a technical '
+                           'interview, a system design round and a final conversation with the hiring manager. The '
+                           'process usually completes within three weeks.',
+    'company_website': 'www.acme-analytics.example',
+}
+
+_WORDS = ('design build operate scale services data pipelines customers quality reliable secure teams platform '
+          'analytics models reporting compliance stakeholders delivery roadmap mentoring incidents performance '
+          'automation testing review planning budget forecasting inventory operations support training').split()
+
+# Items per list section and words per item for each synthetic fixture size
+FIXTURE_SIZES = {
+    'small': (3, 12),
+    'medium': (6, 30),
+    'large': (10, 55),
+}
+
+def _sentence(rng, words):
+    return ' '.join(rng.choice(_WORDS) for _ in range(words)).capitalize() + '.'
+
+def _items(rng, count, words):
+    return [f"{' '.join(rng.choice(_WORDS) for _ in range(2)).title()}: {_sentence(rng, words)}" for _ in range(count)]
+
+def make_job_data(size='medium', seed=0):
+    """Deterministic synthetic job_data; dict-shaped sections mirror what the model sometimes returns"""
+    rng = random.Random(f"{size}-{seed}")
+    count, words = FIXTURE_SIZES[size]
+    data = dict(SAMPLE_JOB_DATA)
+    data.update({
+        'job_title': f"{rng.choice(['Senior', 'Lead', 'Staff'])} {rng.choice(['Backend', 'Data', 'Platform'])} Engineer",
+        'company_overview': _sentence(rng, words * 2),
+        'role_overview': _sentence(rng, words * 4),
+        'key_responsibilities': _items(rng, count, words),
+        'technical_requirements': {'must_have_skills': _items(rng, count, words),
+                                   'nice_to_have_skills': _items(rng, max(1, count // 3), words)},
+        'who_you_are': _items(rng, count, words),
+        'experience_skills': {'professional_experience': _items(rng, max(2, count // 2), words)},
+        'qualifications': {'mandatory_requirements': _items(rng, max(2, count // 2), words)},
+        'preferred_qualifications': _items(rng, max(2, count // 2), words),
+        'what_we_offer': _items(rng, count, words),
+        'benefits': {'health': _items(rng, max(1, count // 2), words), 'perks': _items(rng, max(1, count // 2), words)},
+        'application_process': _sentence(rng, words * 2),
+    })
+    return data
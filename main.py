@@ -1,9 +1,31 @@
+import argparse
+import importlib
+import json
 import os
+import threading
 from dotenv import load_dotenv
-from utils.pdf_generator import create_job_description_pdf
-from utils.gemini_generator import generate_with_gemini
+from utils import instrumentation
+# The Gemini SDK and ReportLab take most of a second to import, so they are imported where they are first used
 load_dotenv()
-def interactive_mode():
+
+def configure_pdf_output(args):
+    """Apply --reproducible and --output-store to the shared PDF renderer"""
+    if args.reproducible or args.output_store:
+        from utils.pdf_generator import apply_output_settings
+        apply_output_settings(args.reproducible, args.output_store)
+
+def preload_modules(*module_names):
+    """Import modules on a background thread, e.g. while the user is still typing"""
+    def _import_all():
+        for module_name in module_names:
+            try:
+                importlib.import_module(module_name)
+            except Exception:
+                pass
+    threading.Thread(target=_import_all, name='jd-preload', daemon=True).start()
+
+def interactive_mode(api_key=None, cache=None, structured=False, scheduler=None, formats=None):
+    preload_modules('google.generativeai', 'utils.pdf_generator')
 
     job_prompt = input("Enter job description prompt: ").strip()
     if not job_prompt: 
@@ -20,15 +42,162 @@ def interactive_mode():
         logo_path = None
     
     try:
-        job_data = generate_with_gemini(job_prompt)
-        create_job_description_pdf(output_file, job_data, logo_path)
-        print(f"\n🎉 Success! Generated PDF: {output_file}")
+        from utils.gemini_generator import generate_with_gemini
+        from utils.output_formats import write_formats
+        with instrumentation.timer('request', mode='interactive'):
+            job_data = generate_with_gemini(job_prompt, api_key, cache=cache, structured=structured, scheduler=scheduler)
+            paths = write_formats(output_file, job_data, formats or ['pdf'], logo_path)
+        print(f"\n🎉 Success! Generated {', '.join(paths)}")
+    except Exception as e:
+        print(f"❌ Error: {e}")
+
+def batch_mode(args, cache=None, scheduler=None):
+    from utils.batch_processor import run_batch
+    logo_path = args.logo if args.logo and os.path.exists(args.logo) else None
+    manifest_path = args.manifest or os.path.join(args.output_dir, 'manifest.jsonl')
+    try:
+        summary = run_batch(args.batch, manifest_path, output_dir=args.output_dir, concurrency=args.concurrency,
+                            render_workers=args.render_workers, logo_path=logo_path, api_key=args.api_key, cache=cache,
+                            render_processes=args.render_processes, structured=args.structured,
+                            scheduler=scheduler)
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        return
+    print(f"\n🎉 Batch finished: {summary['ok']} succeeded, {summary['error']} failed, {summary['skipped']} skipped. Manifest: {manifest_path}")
+
+def render_only_mode(args):
+    """Build the requested formats from job_data saved as JSON; the Gemini SDK is never imported"""
+    from utils.output_formats import write_formats
+    output_file = args.output or os.path.splitext(args.render_only)[0] + '.pdf'
+    logo_path = args.logo if args.logo and os.path.exists(args.logo) else None
+    try:
+        with open(args.render_only, 'r', encoding='utf-8') as f:
+            job_data = json.load(f)
+        if not isinstance(job_data, dict):
+            raise ValueError(f"{args.render_only} must contain a JSON object")
+        with instrumentation.timer('request', mode='render_only'):
+            paths = write_formats(output_file, job_data, args.formats, logo_path)
+        print(f"\n🎉 Success! Generated {', '.join(paths)}")
+    except Exception as e:
+        print(f"❌ Error: {e}")
+
+def edit_mode(args, scheduler=None):
+    """Regenerate only the --regenerate keys of saved job_data, save it back and re-render it"""
+    from utils.gemini_generator import regenerate_with_gemini
+    from utils.job_schema import schema_fields
+    from utils.output_formats import write_formats
+    output_file = args.output or os.path.splitext(args.edit)[0] + '.pdf'
+    logo_path = args.logo if args.logo and os.path.exists(args.logo) else None
+    try:
+        with open(args.edit, 'r', encoding='utf-8') as f:
+            job_data = json.load(f)
+        if not isinstance(job_data, dict):
+            raise ValueError(f"{args.edit} must contain a JSON object")
+        unknown = [key for key in args.regenerate or [] if key not in schema_fields()]
+        if unknown:
+            raise ValueError(f"Unknown job_data keys: {', '.join(unknown)}")
+        with instrumentation.timer('request', mode='edit'):
+            if args.regenerate:
+                print(f"🤖 Regenerating {', '.join(args.regenerate)}...")
+                job_data = regenerate_with_gemini(job_data, args.regenerate, args.instruction or '', args.api_key,
+                                                  args.structured, scheduler)
+                with open(args.edit, 'w', encoding='utf-8') as f:
+                    json.dump(job_data, f, ensure_ascii=False, indent=2)
+            paths = write_formats(output_file, job_data, args.formats, logo_path)
+        print(f"\n🎉 Success! Generated {', '.join(paths)}")
     except Exception as e:
         print(f"❌ Error: {e}")
 
+def serve_mode(args, cache=None, scheduler=None):
+    """Serve generate, render and generate+render over HTTP until interrupted"""
+    from utils.gemini_generator import get_generator
+    from utils.http_service import JobDescriptionService, run_service
+    logo_path = args.logo if args.logo and os.path.exists(args.logo) else None
+    try:
+        generator = get_generator(args.api_key, args.structured, scheduler)
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        return
+    service = JobDescriptionService(generator, cache, logo_path, request_timeout=args.request_timeout,
+                                    render_workers=args.render_workers, render_processes=args.render_processes)
+    run_service(service, args.host, args.port)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate job description PDFs with Gemini")
+    parser.add_argument('--api-key', help="Gemini API key (defaults to GEMINI_API_KEY)")
+    parser.add_argument('--structured', action='store_true', help="Request schema-constrained JSON from Gemini and validate it")
+    parser.add_argument('--batch', metavar='JSONL', help="Process prompts from a JSONL file instead of prompting interactively")
+    parser.add_argument('--serve', action='store_true', help="Run a local HTTP service for generate, render and generate+render requests")
+    parser.add_argument('--host', default='127.0.0.1', help="Address for --serve (default: 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=8080, help="Port for --serve (default: 8080)")
+    parser.add_argument('--request-timeout', type=float, default=120.0, help="Seconds before a --serve request fails with 504 (default: 120)")
+    parser.add_argument('--render-only', metavar='JSON', help="Render a PDF from job_data saved as JSON without calling Gemini")
+    parser.add_argument('--edit', metavar='JSON', help="Update job_data saved as JSON in place, regenerating only the --regenerate keys, then render it")
+    parser.add_argument('--regenerate', nargs='+', metavar='KEY', help="job_data keys to rewrite with --edit, e.g. salary_range key_responsibilities")
+    parser.add_argument('--instruction', help="What to change in the --regenerate keys, e.g. \"raise the salary by 10%%\"")
+    parser.add_argument('--output', help="Output path for --render-only and --edit (default: the JSON path with a .pdf extension)")
+    parser.add_argument('--formats', nargs='+', default=['pdf'], choices=['pdf', 'html', 'markdown', 'text'], help="Output formats: pdf, html, markdown, text (default: pdf); each is written beside the PDF path with its own extension")
+    parser.add_argument('--output-dir', default='output', help="Directory for batch PDFs (default: output)")
+    parser.add_argument('--manifest', help="Batch manifest path (default: <output-dir>/manifest.jsonl)")
+    parser.add_argument('--concurrency', type=int, default=4, help="Concurrent Gemini calls in batch mode (default: 4)")
+    parser.add_argument('--render-workers', type=int, default=2, help="PDF rendering workers in batch and --serve mode (default: 2)")
+    parser.add_argument('--render-processes', type=int, default=0, help="Render batch and --serve documents in this many worker processes instead of threads")
+    parser.add_argument('--reproducible', action='store_true', help="Write byte-identical PDFs for identical input, logo and template version")
+    parser.add_argument('--output-store', metavar='DIR', help="Content-addressed store of reproducible PDFs; repeat postings are hard-linked from it instead of rendered")
+    parser.add_argument('--logo', help="Default logo path for batch records and --render-only")
+    parser.add_argument('--cache-db', help="SQLite file for caching Gemini responses across runs")
+    parser.add_argument('--no-cache', action='store_true', help="Disable the Gemini response cache")
+    parser.add_argument('--cache-ttl', type=float, default=7 * 24 * 3600, help="Cache entry lifetime in seconds (default: 7 days)")
+    parser.add_argument('--models', nargs='+', help="Gemini models to try in order when one is unavailable (default: gemini-1.5-flash)")
+    parser.add_argument('--rpm', type=int, help="Gemini requests-per-minute limit to pace calls against")
+    parser.add_argument('--tpm', type=int, help="Gemini tokens-per-minute limit to pace calls against")
+    parser.add_argument('--model-concurrency', type=int, default=4, help="Concurrent requests allowed per model (default: 4)")
+    parser.add_argument('--max-attempts', type=int, default=5, help="Attempts per model for rate-limited or failed calls (default: 5)")
+    parser.add_argument('--hedge-after', type=float, help="Send a duplicate request when a call takes longer than this many seconds")
+    parser.add_argument('--metrics-prom', metavar='PATH', help="Write per-stage timings and counters in Prometheus text format on exit")
+    parser.add_argument('--metrics-jsonl', metavar='PATH', help="Append every timing and counter event to a JSON lines file")
+    return parser.parse_args(argv)
+
+def build_scheduler(args):
+    from utils.gemini_generator import DEFAULT_MODEL_NAMES
+    from utils.request_scheduler import RequestScheduler
+    return RequestScheduler(args.models or DEFAULT_MODEL_NAMES, requests_per_minute=args.rpm, tokens_per_minute=args.tpm,
+                            max_concurrency_per_model=args.model_concurrency, max_attempts=args.max_attempts,
+                            hedge_after=args.hedge_after)
+
+def generate_mode(args):
+    from utils.response_cache import ResponseCache
+    cache = None if args.no_cache else ResponseCache(args.cache_db, ttl_seconds=args.cache_ttl)
+    scheduler = build_scheduler(args)
+    try:
+        if args.serve:
+            serve_mode(args, cache, scheduler)
+        elif args.edit:
+            edit_mode(args, scheduler)
+        elif args.batch:
+            batch_mode(args, cache, scheduler)
+        else:
+            interactive_mode(args.api_key, cache, args.structured, scheduler, args.formats)
+    finally:
+        scheduler.close()
+        if cache:
+            cache.close()
+
 def main():
-    interactive_mode()
+    args = parse_args()
+    recorder = instrumentation.enable() if args.metrics_prom or args.metrics_jsonl else None
+    exporter = recorder.add_hook(instrumentation.JsonlExporter(args.metrics_jsonl)) if args.metrics_jsonl else None
+    try:
+        configure_pdf_output(args)
+        if args.render_only:
+            render_only_mode(args)
+        else:
+            generate_mode(args)
+    finally:
+        if exporter:
+            exporter.close()
+        if args.metrics_prom:
+            recorder.write_prometheus(args.metrics_prom)
 
 if __name__ == "__main__":
     main()
-
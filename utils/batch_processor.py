@@ -0,0 +1,195 @@
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.gemini_generator import generate_with_gemini
+from utils.pdf_generator import create_job_description_pdf, get_output_settings
+from utils.render_farm import RenderFarm
+
+def load_completed_ids(manifest_path):
+    """Return the ids that already have a successful entry in the manifest"""
+    completed = set()
+    if not manifest_path or not os.path.exists(manifest_path):
+        return completed
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if entry.get('status') == 'ok':
+                completed.add(str(entry.get('id')))
+    return completed
+
+def iter_batch_records(input_path):
+    """Stream (record_id, record) pairs from a JSONL file without loading it whole"""
+    with open(input_path, 'r', encoding='utf-8') as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield str(line_no), {'_error': f"Invalid JSON on line {line_no}: {e}"}
+                continue
+            if isinstance(record, str):
+                record = {'prompt': record}
+            elif not isinstance(record, dict):
+                yield str(line_no), {'_error': f"Line {line_no} is not a JSON object"}
+                continue
+            record_id = record.get('id', record.get('request_id', line_no))
+            yield str(record_id), record
+
+def _output_path_for(record_id, record, output_dir):
+    output_file = record.get('output') or record.get('output_file')
+    if output_file and not isinstance(output_file, str):
+        raise ValueError("'output' must be a string path")
+    if not output_file:
+        safe_id = re.sub(r'[^A-Za-z0-9._-]+', '_', record_id).strip('._') or 'job_description'
+        output_file = f"{safe_id}.pdf"
+    if not output_file.lower().endswith('.pdf'):
+        output_file += '.pdf'
+    if not os.path.isabs(output_file):
+        output_file = os.path.join(output_dir, output_file)
+    return output_file
+
+class ManifestWriter:
+    """Thread-safe, append-only JSONL manifest so interrupted runs can resume"""
+
+    def __init__(self, manifest_path):
+        self._lock = threading.Lock()
+        self.counts = {'ok': 0, 'error': 0}
+        manifest_dir = os.path.dirname(os.path.abspath(manifest_path))
+        os.makedirs(manifest_dir, exist_ok=True)
+        self._file = open(manifest_path, 'a', encoding='utf-8')
+
+    def write(self, entry):
+        line = json.dumps(entry, ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + '\n')
+            self._file.flush()
+            self.counts[entry['status']] = self.counts.get(entry['status'], 0) + 1
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+def run_batch(input_path, manifest_path, output_dir='.', concurrency=4, render_workers=2, logo_path=None, api_key=None, cache=None, render_processes=0, structured=False, scheduler=None, generate_fn=None, render_fn=None):
+    """Generate and render every prompt in a JSONL file.
+
+    Gemini calls run on one thread pool and PDF rendering on another; finished
+    job_data dicts are handed from the first to the second through a bounded
+    backlog, so neither stage stalls the other until that backlog is full.
+    With ``render_processes`` set, rendering moves to a RenderFarm of that many
+    processes instead of the render thread pool. Each record gets one manifest
+    line, and records already marked ``ok`` in the manifest are skipped on rerun.
+    A ``scheduler`` keeps the Gemini calls within the API's rate limits.
+    ``render_fn`` replaces create_job_description_pdf on the render threads;
+    RenderFarm workers always use the shared renderer, so it cannot be
+    combined with ``render_processes``.
+    """
+    if render_fn is not None and render_processes:
+        raise ValueError("render_fn cannot be used with render_processes; RenderFarm workers use the shared renderer")
+    generate_fn = generate_fn or (lambda prompt: generate_with_gemini(prompt, api_key, cache=cache, structured=structured, scheduler=scheduler))
+    render_fn = render_fn or create_job_description_pdf
+    concurrency, render_workers = max(1, concurrency), max(1, render_workers)
+    os.makedirs(output_dir, exist_ok=True)
+
+    completed = load_completed_ids(manifest_path)
+    manifest = ManifestWriter(manifest_path)
+    # Bound the number of records held in memory at each stage
+    generate_slots = threading.BoundedSemaphore(concurrency * 2)
+    render_slots = threading.BoundedSemaphore(render_workers * 2)
+    skipped = 0
+    generate_times = {}
+    render_farm = None
+
+    def _render(record_id, output_file, job_data, record_logo, generate_seconds):
+        start = time.perf_counter()
+        entry = {'id': record_id, 'output': output_file, 'generate_seconds': round(generate_seconds, 3)}
+        try:
+            render_fn(output_file, job_data, record_logo)
+            entry.update(status='ok')
+        except Exception as e:
+            entry.update(status='error', stage='render', error=str(e))
+        finally:
+            entry['render_seconds'] = round(time.perf_counter() - start, 3)
+            render_slots.release()
+        manifest.write(entry)
+
+    def _farm_result(result):
+        entry = {'id': result['id'], 'output': result['output'],
+                 'generate_seconds': round(generate_times.pop(result['id'], 0.0), 3), 'status': result['status']}
+        if result['status'] != 'ok':
+            entry.update(stage='render', error=result.get('error', ''))
+        entry['render_seconds'] = result.get('render_seconds', 0.0)
+        manifest.write(entry)
+
+    def _generate(record_id, record, render_pool):
+        # Every path below writes exactly one manifest line for the record, here or once it is rendered
+        output_file = None
+        start = time.perf_counter()
+        try:
+            try:
+                if '_error' in record:
+                    raise ValueError(record['_error'])
+                output_file = _output_path_for(record_id, record, output_dir)
+                record_logo = record.get('logo_path', logo_path)
+                if record_logo is not None and not isinstance(record_logo, str):
+                    raise ValueError("'logo_path' must be a string path")
+                if record_logo and not os.path.exists(record_logo):
+                    record_logo = None
+                prompt = str(record.get('prompt', '')).strip()
+                if not prompt:
+                    raise ValueError("Record has no prompt")
+                job_data = generate_fn(prompt)
+            except Exception as e:
+                manifest.write({'id': record_id, 'status': 'error', 'stage': 'generate', 'output': output_file,
+                                'error': str(e), 'generate_seconds': round(time.perf_counter() - start, 3)})
+                return
+            generate_seconds = time.perf_counter() - start
+
+            try:
+                if render_farm is not None:
+                    generate_times[record_id] = generate_seconds
+                    render_farm.submit(output_file, job_data, record_logo, job_id=record_id)
+                else:
+                    render_slots.acquire()
+                    try:
+                        render_pool.submit(_render, record_id, output_file, job_data, record_logo, generate_seconds)
+                    except Exception:
+                        render_slots.release()
+                        raise
+            except Exception as e:
+                generate_times.pop(record_id, None)
+                manifest.write({'id': record_id, 'status': 'error', 'stage': 'render', 'output': output_file,
+                                'error': f"Could not queue render: {e}", 'generate_seconds': round(generate_seconds, 3)})
+        finally:
+            generate_slots.release()
+
+    try:
+        if render_processes:
+            render_farm = RenderFarm(workers=render_processes, preload_logo_path=logo_path, on_result=_farm_result,
+                                     output_settings=get_output_settings())
+        with ThreadPoolExecutor(max_workers=render_workers, thread_name_prefix='jd-render') as render_pool:
+            with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='jd-generate') as generate_pool:
+                for record_id, record in iter_batch_records(input_path):
+                    if record_id in completed:
+                        skipped += 1
+                        continue
+                    generate_slots.acquire()
+                    generate_pool.submit(_generate, record_id, record, render_pool)
+    finally:
+        # The farm's supervisor writes manifest lines, so it must stop before the manifest closes
+        if render_farm is not None:
+            render_farm.close()
+        manifest.close()
+
+    return {'ok': manifest.counts.get('ok', 0), 'error': manifest.counts.get('error', 0), 'skipped': skipped}
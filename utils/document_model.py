@@ -0,0 +1,106 @@
+from collections import namedtuple
+from utils.job_schema import METADATA_ITEMS, SECTIONS
+
+# kind is 'bullet' (optional bold title plus text), 'label' (a bold sub-heading) or 'paragraph'
+Block = namedtuple('Block', ['kind', 'text', 'title'])
+# separator is False only for the closing Application Process section
+Section = namedtuple('Section', ['key', 'title', 'blocks', 'separator'])
+JobDocument = namedtuple('JobDocument', ['title', 'metadata', 'sections', 'company_name', 'company_website'])
+
+def has_content(value):
+    if value is None:
+        return False
+    if isinstance(value, str):
+        return value.strip() != ""
+    if isinstance(value, (list, tuple)):
+        return any(has_content(item) for item in value)
+    if isinstance(value, dict):
+        return any(has_content(v) for v in value.values())
+    return bool(value)
+
+def bullet_blocks(content_list):
+    """'Title: description' strings become titled bullets; anything else a plain bullet"""
+    blocks = []
+    for item in content_list:
+        if not has_content(item):
+            continue
+        if isinstance(item, str) and ':' in item:
+            title, content = item.split(':', 1)
+            blocks.append(Block('bullet', content.strip() if has_content(content) else '', title.strip()))
+        else:
+            blocks.append(Block('bullet', str(item), None))
+    return blocks
+
+def _items_blocks(items):
+    """A list becomes bullets, anything else a single paragraph"""
+    if isinstance(items, list):
+        return bullet_blocks(items)
+    return [Block('paragraph', str(items), None)]
+
+def _dict_section_blocks(key, section_data):
+    """Blocks for the dict shapes the model sometimes returns instead of a list"""
+    blocks = []
+    if key == 'technical_requirements':
+        must_have = section_data.get('must_have_skills', [])
+        nice_to_have = section_data.get('nice_to_have_skills', [])
+        if has_content(must_have):
+            blocks.extend(_items_blocks(must_have))
+        if has_content(nice_to_have):
+            blocks.append(Block('label', 'Nice to have:', None))
+            blocks.extend(_items_blocks(nice_to_have))
+
+    elif key in ['qualifications', 'experience_skills']:
+        items = section_data.get('mandatory_requirements' if key == 'qualifications' else 'professional_experience', [])
+        if has_content(items):
+            blocks.extend(_items_blocks(items))
+
+    elif key in ['what_we_offer', 'benefits']:
+        all_items = []
+        for value in section_data.values():
+            if has_content(value):
+                if isinstance(value, list):
+                    all_items.extend(value)
+                else:
+                    all_items.append(str(value))
+        # Limit items to prevent overflow
+        max_items = 8 if key == 'benefits' else 5
+        blocks.extend(bullet_blocks(all_items[:max_items]))
+
+    elif key == 'application_process':
+        how_to_apply = section_data.get('how_to_apply', '')
+        if has_content(how_to_apply):
+            blocks.append(Block('paragraph', str(how_to_apply), None))
+
+    else:
+        for name, value in section_data.items():
+            if has_content(value):
+                blocks.append(Block('label', f"{name.replace('_', ' ').title()}:", None))
+                blocks.extend(_items_blocks(value))
+    return blocks
+
+def normalize_job_data(data):
+    """Resolve job_data once into the JobDocument every output format renders from.
+
+    Empty fields are dropped, the benefits fallback and dict-shaped sections
+    are flattened into blocks, and the header and footer fields are pulled
+    out, so renderers only walk the tree and never look at job_data.
+    """
+    metadata = [(label, str(data[key])) for key, label in METADATA_ITEMS if has_content(data.get(key, ''))]
+
+    sections = []
+    for key, title in SECTIONS:
+        section_data = data.get(key, '')
+        if key == 'benefits' and not has_content(section_data):
+            section_data = data.get('compensation_benefits', {})
+        if not has_content(section_data):
+            continue
+        if isinstance(section_data, list):
+            blocks = bullet_blocks(section_data)
+        elif isinstance(section_data, dict):
+            blocks = _dict_section_blocks(key, section_data)
+        else:
+            blocks = [Block('paragraph', str(section_data), None)]
+        sections.append(Section(key, title, blocks, key != SECTIONS[-1][0]))
+
+    return JobDocument(title=data.get('job_title', 'Software Developer'), metadata=metadata, sections=sections,
+                       company_name=data.get('company_name', ''), company_website=data.get('company_website', ''))
@@ -1,130 +1,461 @@
-import json
+import asyncio
+import contextlib
 import os
-import google.generativeai as genai
+import threading
+import time
+from utils import instrumentation
+from utils.job_schema import response_schema, schema_fields, validate_job_data
+from utils.json_repair import JsonRepairError, repair_json
+from utils.json_stream import JsonFieldStream
+from utils.prompt_builder import default_prompt_builder, estimate_tokens
+from utils.response_cache import make_cache_key
 
-def generate_with_gemini(prompt, api_key=None):
+DEFAULT_MODEL_NAMES = ['gemini-1.5-flash']
+
+def resolve_api_key(api_key=None):
     if not api_key:
         api_key = os.getenv('GEMINI_API_KEY')
         if not api_key:
             raise ValueError("Gemini API key not found. Please set GEMINI_API_KEY in your .env file or pass --api-key parameter")
-    
-    genai.configure(api_key=api_key)
-    model = None
-    for model_name in ['gemini-1.5-flash']:
-        try:
-            model = genai.GenerativeModel(model_name)
-            break
-        except: continue
-    
-    if not model:
-        raise Exception("No available Gemini models found. Please check your API key and available models.")
-    
-    enhanced_prompt = f"""You are a professional HR specialist who writes job descriptions with accuracy and clarity for ALL industries.
-Create a comprehensive job description based STRICTLY on this user prompt: "{prompt}"
-CRITICAL INSTRUCTION: DO NOT include any placeholder information, fake details, or generic website references in the output. If specific company information is not provided in the prompt, leave those fields empty.
-Generate a detailed JSON response with this structure (keep fields flat, avoid deep nesting). The company_overview must appear right after experience_required:
-
-{{
-    "company_name": "{{Extract company name from prompt; if not provided return ''}}",
-    "job_title": "{{Extract job title from prompt; if not provided, infer from skills/role mentioned}}",
-    "job_code": "{{Generate only if mentioned in prompt, otherwise return ''}}",
-    "location": "{{Extract location from prompt; if not mentioned return ''}}",
-    "department": "{{Extract department from prompt; if not mentioned return ''}}",
-    "team": "{{Extract team info from prompt; if not mentioned return ''}}",
-    "reporting_to": "{{Extract reporting structure from prompt; if not mentioned return ''}}",
-    "employment_type": "{{Extract employment type from prompt; if not mentioned return ''}}",
-    "experience_required": "{{Extract exact experience from prompt example Fresher, Entry Level, Mid Level, Senior Level,Trainee; if not mentioned return ''}}",
-    "office_timings": "{{Extract office hours, work timings, shift timings from prompt; if not mentioned return ''}}",
-    "working_days": "{{Extract working days, work week schedule from prompt; if not mentioned return ''}}",
-    "industry_type": "{{Identify industry: IT/Technology, Healthcare/Medical, Manufacturing, Finance/Banking, Education, Retail, Construction, Government, Non-Profit, Other}}",
-    
-    "company_overview": "{{If company_name is provided, generate a tailored overview. If not, return a generic 50-word overview matching the industry type. Do not display this instruction in the output. Do not provide fake or incorrect information about the company}}",
-
-    "role_overview": "{{Generate comprehensive 100-120 word overview based on role responsibilities and industry context mentioned in prompt}}",
-    "salary_range": "{{Extract salary from the prompt exactly as written; do not use any currency symbols; if the user enters '3.5 LPA', keep it as '3.5 LPA' (do not convert to 350000); if salary is not mentioned, return ''}}"
-
-    "key_responsibilities": [
-        "Primary Role Focus: {{30-50 word detailed description of main responsibility related to core function mentioned in prompt, including specific tasks and expected outcomes}}",
-        "{{Industry-Specific }}: {{30-50 word explanation of key industry-specific duties, processes, and deliverables}}",
-        "Quality & Standards Compliance: {{30-50 word description covering industry standards, quality control, safety protocols, and regulatory compliance}}",
-        "{{Process/Project Management}}: {{30-50 word explanation of workflow management, project coordination, and performance monitoring}}",
-        "Documentation & Reporting: {{30-50 word description of record keeping, reporting standards, data management, and communication protocols}}",
-        "Team Collaboration: {{30-50 word explanation of cross-functional collaboration, stakeholder communication, and team coordination}}"
-    ],
-    
-    "technical_requirements": [
-        "{{Core Skill 1 from prompt}}: {{Detailed explanation of proficiency level, tools, equipment, software, or techniques required}}",
-        "{{Core Skill 2 from prompt}}: {{Comprehensive description of expertise level, related knowledge, and practical application experience}}",
-        "{{Core Skill 3 from prompt}}: {{Detailed explanation of mastery level, specialized knowledge, and operational skills}}",
-        "{{Additional relevant skill/certification}}: {{Description of supporting professional knowledge, licenses, or certifications}}"
-    ],
-    
-
-    "who_you_are": [
-        "Professional Excellence: {{30-50 word description of professional attitude, work ethic, reliability, and commitment with industry-specific examples}}",
-        "Industry Expertise: {{30-50 word explanation of domain knowledge, learning ability, innovation mindset, and adaptation skills}}",
-        "Communication Skills: {{30-50 word description of interpersonal abilities, client/patient interaction, and stakeholder management}}",
-        "Problem-Solving Mindset: {{30-50 word explanation of analytical thinking, troubleshooting methodology, and solution-oriented approach}}"
-    ],
-    
-    "experience_skills": [  
-        "Professional Experience: {{50-70 word description of required experience level, role progression, achievements, and relevant background based on user prompt}}",
-        "Industry Expertise: {{30-50 word explanation of domain-specific knowledge, practical applications, and specialized skills mentioned in prompt}}",
-        "Functional Knowledge: {{30-40 word description of operational expertise, cross-functional experience, and process understanding}}"
-    ],
-    
-    "qualifications": [
-        "Educational Background: {{30-50 word description of academic requirements, relevant degrees, diplomas, or educational qualifications}}",
-        "Professional Experience: {{30-50 word explanation of work experience requirements and career progression based on user prompt}}",
-        "{{Industry-Specific Requirements}}: {{30-50 word description of licenses, certifications, registrations, or specialized qualifications}}"
-    ],
-    
-    "preferred_qualifications": [
-        "Advanced {{Industry}} Skills: {{30-50 word description of additional specialized knowledge and advanced competencies}}",
-        "Professional Certifications: {{30-50 word explanation of industry certifications, continuing education, and professional development}}",
-        "Leadership Experience: {{30-50 word description of supervisory experience, team management, and project leadership capabilities}}"
-    ],
-    
-    "what_we_offer": [
-        "Career Growth Opportunities: {{40-50 word description of advancement paths, skill development, training programs, and learning opportunities}}",
-        "{{Industry-Appropriate}} Work Environment: {{40-50 word explanation of workplace culture, modern facilities, safety standards, and support systems}}",
-        "Competitive Compensation: {{40-50 word description of salary structure, bonuses, incentives, and performance-based rewards}}",
-        "Work-Life Balance: {{40-50 word explanation of flexible arrangements, leave policies, and employee wellness programs}}",
-        "Professional Development: {{40-50 word description of training opportunities, skill enhancement, and career advancement support}}"
-    ],
-    
-    "benefits": [
-        "Health & Wellness Coverage: {{30-55 word description of medical insurance, health benefits, wellness programs, and healthcare support}}",
-        "Learning & Development Support: {{30-55 word explanation of training allowances, certification support, and professional growth programs}}",
-        "{{Work Arrangement Benefits}}: {{30-55 word description of flexible work options, location benefits, and work-life integration}}",
-        "{{Industry-Specific Allowances}}: {{30-55 word explanation of relevant allowances, equipment support, or specialized benefits}}",
-        "Team Culture & Engagement: {{30-55 word description of team activities, company culture, recognition programs, and employee engagement}}"
-    ],
-    
-    "application_process": "{{Generate professional application process suitable for the industry and role level. Mention typical steps: application review, screening, assessment/interview rounds, reference checks, decision. Timeline 2-4 weeks. Avoid fake contact details.}}",
-    
-    "company_website": "{{ONLY include if user explicitly mentions a website URL in their prompt, otherwise leave empty}}"
-}}
-
-INDUSTRY-SPECIFIC ADAPTATIONS:
-- For IT/Tech roles: Focus on technical skills, coding, software, frameworks
-- For Healthcare/Medical: Emphasize patient care, medical procedures, certifications, compliance
-- For Manufacturing: Highlight production processes, safety, quality control, equipment operation
-- For Finance/Banking: Focus on financial analysis, regulations, risk management, client services
-- For Education: Emphasize teaching methods, curriculum, student development, educational technology
-- For Retail: Focus on customer service, sales, inventory, merchandising
-- For Construction: Highlight safety protocols, technical skills, project management, regulations
-- For Non-Profit: Emphasize mission alignment, community impact, fundraising, program management
-
-Return ONLY the JSON object, no markdown formatting or additional text."""
-    
-    response = model.generate_content(enhanced_prompt)
-    response_text = response.text.strip()
-    if response_text.startswith('```json'): response_text = response_text[7:]
-    if response_text.endswith('```'): response_text = response_text[:-3]
-    response_text = response_text.strip()
-    
+    return api_key
+
+def build_enhanced_prompt(prompt):
+    """The whole prompt as one string, for models created without the system instruction"""
+    return default_prompt_builder.build_single(prompt)
+
+def parse_response_text(response_text):
+    """Parse a response, locally repairing fences, missing or trailing commas and truncation"""
+    return repair_json(response_text)[0]
+
+def _chunk_text(chunk):
+    try:
+        return chunk.text or ''
+    except ValueError:
+        # Chunks carrying only safety or finish metadata have no text parts
+        return ''
+
+def record_usage_metadata(usage, chunk):
+    """Copy the API's token counts from a response or chunk into usage, when it reports them"""
+    metadata = getattr(chunk, 'usage_metadata', None)
+    if not metadata:
+        return
+    for key, attribute in (('prompt_tokens', 'prompt_token_count'), ('output_tokens', 'candidates_token_count'),
+                           ('cached_tokens', 'cached_content_token_count')):
+        value = getattr(metadata, attribute, None)
+        if value:
+            usage[key] = value
+
+def iter_response_text(response, usage=None):
+    """Yield the text of each streamed chunk; non-streaming responses yield their text once"""
     try:
-        return json.loads(response_text)
-    except json.JSONDecodeError as e:
-        raise Exception(f"Failed to parse Gemini response as JSON: {e}")
\ No newline at end of file
+        chunks = iter(response)
+    except TypeError:
+        if usage is not None:
+            record_usage_metadata(usage, response)
+        yield response.text
+        return
+    try:
+        for chunk in chunks:
+            if usage is not None:
+                record_usage_metadata(usage, chunk)
+            text = _chunk_text(chunk)
+            if text:
+                yield text
+    finally:
+        # Scheduled streams hold a model slot until closed, including when the caller stops early
+        close = getattr(chunks, 'close', None)
+        if close is not None:
+            close()
+
+def open_stream(response):
+    """Pull the first chunk of a streamed response so errors raised when the stream opens surface here"""
+    try:
+        chunks = iter(response)
+    except TypeError:
+        return response
+    first = next(chunks, None)
+    return chunks if first is None else _OpenedStream(first, chunks)
+
+class _OpenedStream:
+    """A streamed response whose first chunk was already pulled; closing it closes the response"""
+
+    def __init__(self, first, chunks):
+        self._pending = [first]
+        self._chunks = chunks
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return self._pending.pop() if self._pending else next(self._chunks)
+
+    def close(self):
+        self._pending = []
+        close = getattr(self._chunks, 'close', None)
+        if close is not None:
+            close()
+
+def finish_field_stream(parser):
+    """Return the complete job_data and the repairs needed to get it.
+
+    When the stream did not parse cleanly the whole text goes through
+    repair_json; JsonRepairError is raised if it cannot be recovered or
+    does not hold a JSON object.
+    """
+    if parser.done and not parser.errors:
+        return dict(parser.fields), list(parser.repairs)
+    job_data, repairs = repair_json(parser.text)
+    if not isinstance(job_data, dict):
+        raise JsonRepairError("Failed to parse Gemini response as JSON: expected an object")
+    return job_data, repairs
+
+def _unsent_fields(job_data, sent):
+    return [(key, value) for key, value in job_data.items() if sent.get(key, _UNSENT) != value]
+
+_UNSENT = object()
+
+class GeminiGenerator:
+    """Long-lived Gemini client that builds each model once and is shared by threads and coroutines.
+
+    ``structured`` constrains responses to the job_data schema, and a ``scheduler`` paces, retries and fails over requests.
+    """
+
+    def __init__(self, api_key=None, model_names=None, model=None, cache=None, structured=False, max_retries=1,
+                 prompt_builder=None, on_usage=None, scheduler=None):
+        self.api_key = api_key
+        self.model_names = list(model_names or DEFAULT_MODEL_NAMES)
+        self.cache = cache
+        self.structured = structured
+        self.max_retries = max_retries
+        self.prompt_builder = prompt_builder or default_prompt_builder
+        self.on_usage = on_usage
+        self.scheduler = scheduler
+        self.stats = {'responses': 0, 'clean': 0, 'repaired': 0, 'retried': 0, 'failed': 0, 'invalid': 0, 'repairs': {},
+                      'requests': 0, 'prompt_tokens': 0, 'output_tokens': 0, 'cached_tokens': 0, 'latency_seconds': 0.0}
+        # A model passed in serves every model name; it was built elsewhere and may not carry the system instruction
+        self._injected_model = model
+        self._models = {}
+        self._system_in_model = model is None
+        self._configured = False
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+
+    @property
+    def model(self):
+        return self.model_for(self.model_names[0])
+
+    def model_for(self, model_name):
+        """Model for a name, built on first use and reused by every call; an injected model serves every name"""
+        if self._injected_model is not None:
+            return self._injected_model
+        model = self._models.get(model_name)
+        if model is None:
+            with self._lock:
+                model = self._models.get(model_name)
+                if model is None:
+                    model = self._models[model_name] = self._create_model(model_name)
+        return model
+
+    def _create_model(self, model_name):
+        # Building a model makes no API call, so errors here are configuration errors and are raised as-is;
+        # a model the API cannot serve fails on its first request, where the scheduler fails over
+        # The SDK takes about a second to import, so it is loaded when the first model is built
+        import google.generativeai as genai
+        # genai.configure is process-global, so generators with different API keys should not be used side by side
+        if not self._configured:
+            genai.configure(api_key=resolve_api_key(self.api_key))
+            self._configured = True
+        return genai.GenerativeModel(model_name, system_instruction=self.prompt_builder.system_instruction)
+
+    def cache_key(self, prompt):
+        return make_cache_key(prompt, ','.join(self.model_names), self.prompt_builder.version, self.structured)
+
+    def _contents(self, text):
+        """Prefix the static instructions unless the model already carries them"""
+        if self._system_in_model:
+            return text
+        return self.prompt_builder.system_instruction + "\n\n" + text
+
+    def _report_usage(self, usage, contents, output_text, started):
+        """Pass a request's token counts and latency to on_usage and total them in stats; missing counts are estimated"""
+        if 'prompt_tokens' not in usage:
+            usage['prompt_tokens'] = estimate_tokens(contents) + (self.prompt_builder.system_tokens if self._system_in_model else 0)
+            usage['estimated'] = True
+        if 'output_tokens' not in usage:
+            usage['output_tokens'] = estimate_tokens(output_text)
+            usage['estimated'] = True
+        usage.setdefault('cached_tokens', 0)
+        usage['latency_seconds'] = round(time.perf_counter() - started, 3)
+        with self._stats_lock:
+            self.stats['requests'] += 1
+            for key in ('prompt_tokens', 'output_tokens', 'cached_tokens', 'latency_seconds'):
+                self.stats[key] += usage[key]
+        if instrumentation.get_recorder() is not None:
+            instrumentation.observe('gemini.api_latency', usage['latency_seconds'], kind=usage['kind'])
+            if 'first_token_seconds' in usage:
+                instrumentation.observe('gemini.first_token', usage['first_token_seconds'], kind=usage['kind'])
+            for key in ('prompt_tokens', 'output_tokens', 'cached_tokens'):
+                instrumentation.count(f"gemini.{key}", usage[key])
+        if self.on_usage:
+            self.on_usage(usage)
+
+    def _request_kwargs(self, fields=None):
+        if not self.structured:
+            return {}
+        return {'generation_config': {'response_mime_type': 'application/json', 'response_schema': response_schema(fields)}}
+
+    def _send(self, contents, stream=False, fields=None):
+        """Issue one API request, through the scheduler when there is one and otherwise to the first model"""
+        kwargs = self._request_kwargs(fields)
+        if stream:
+            kwargs['stream'] = True
+        if self.scheduler is None:
+            return self.model.generate_content(contents, **kwargs)
+
+        def request(model_name):
+            response = self.model_for(model_name).generate_content(contents, **kwargs)
+            return open_stream(response) if stream else response
+
+        tokens = estimate_tokens(contents) + (self.prompt_builder.system_tokens if self._system_in_model else 0)
+        return self.scheduler.call(request, tokens, stream=stream)
+
+    def _record(self, outcome, repairs=(), invalid=False):
+        with self._stats_lock:
+            self.stats['responses'] += 1
+            self.stats[outcome] += 1
+            self.stats['invalid'] += int(invalid)
+            for name in repairs:
+                self.stats['repairs'][name] = self.stats['repairs'].get(name, 0) + 1
+
+    def _finish(self, prompt, parser):
+        """Turn a finished stream into job_data, retrying only the fields that could not be recovered.
+
+        Malformed output is repaired locally first, and only what still cannot
+        be recovered is asked for again, up to ``max_retries`` times. With
+        ``structured`` set the result is also validated against the schema.
+        """
+        try:
+            with instrumentation.timer('gemini.json_repair'):
+                job_data, repairs = finish_field_stream(parser)
+            error = None
+        except JsonRepairError as e:
+            job_data, repairs, error = dict(parser.fields), [], e
+        problems = validate_job_data(job_data) if self.structured and error is None else {}
+
+        attempts = 0
+        while (error is not None or problems) and attempts < self.max_retries:
+            attempts += 1
+            instrumentation.count('gemini.retries')
+            keys = [key for key in schema_fields() if key not in job_data or key in problems]
+            try:
+                job_data.update(self._retry_fields(prompt, keys or schema_fields()))
+                error = None
+            except JsonRepairError as e:
+                error = e
+                continue
+            problems = validate_job_data(job_data) if self.structured else {}
+
+        if error is not None:
+            self._record('failed', repairs)
+            raise error
+        # Output that still fails validation is returned as-is; the renderer tolerates missing fields
+        self._record('retried' if attempts else ('repaired' if repairs else 'clean'), repairs, invalid=bool(problems))
+        return job_data
+
+    def _retry_fields(self, prompt, keys):
+        return self._request_fields(self.prompt_builder.build_retry(prompt, keys), 'retry')
+
+    def _request_fields(self, text, kind, fields=None):
+        """One non-streamed request whose answer must be a JSON object"""
+        contents = self._contents(text)
+        usage, started = {'kind': kind}, time.perf_counter()
+        response = self._send(contents, fields=fields)
+        text = ''.join(iter_response_text(response, usage))
+        self._report_usage(usage, contents, text, started)
+        with instrumentation.timer('gemini.json_repair'):
+            fields, _ = repair_json(text)
+        if not isinstance(fields, dict):
+            raise JsonRepairError("Failed to parse Gemini response as JSON: expected an object")
+        return fields
+
+    def regenerate_fields(self, job_data, keys, instruction=''):
+        """Return a copy of job_data with only ``keys`` rewritten by the model.
+
+        The request carries the current values of those keys, the requested
+        change and a few context fields instead of the whole prompt, and the
+        rest of job_data is kept as-is. Keys the answer leaves out are asked
+        for again, up to ``max_retries`` times; any still missing keep their
+        current value.
+        """
+        keys = list(dict.fromkeys(keys))
+        updated = dict(job_data)
+        missing, attempts = keys, 0
+        with instrumentation.timer('gemini.regenerate'):
+            while missing and attempts <= self.max_retries:
+                if attempts:
+                    instrumentation.count('gemini.retries')
+                attempts += 1
+                try:
+                    fields = self._request_fields(self.prompt_builder.build_update(updated, missing, instruction), 'update',
+                                                  fields=missing)
+                except JsonRepairError:
+                    continue
+                updated.update((key, fields[key]) for key in missing if key in fields)
+                missing = [key for key in missing if key not in fields]
+        instrumentation.count('gemini.regenerated_fields', len(keys) - len(missing))
+        return updated
+
+    def _cached(self, prompt, cache):
+        if not cache:
+            return None, None
+        key = self.cache_key(prompt)
+        job_data = cache.get(key)
+        instrumentation.count('gemini.cache_hits' if job_data is not None else 'gemini.cache_misses')
+        return key, job_data
+
+    def stream_fields(self, prompt, cache=None):
+        """Yield (key, value) for each top-level field as soon as the streamed response completes it"""
+        cache = cache or self.cache
+        key, job_data = self._cached(prompt, cache)
+        if job_data is not None:
+            yield from job_data.items()
+            return
+
+        contents = self._contents(self.prompt_builder.user_content(prompt))
+        parser = JsonFieldStream()
+        usage, started = {'kind': 'generate'}, time.perf_counter()
+        response = self._send(contents, stream=True)
+        parse_seconds = 0.0
+        for text in iter_response_text(response, usage):
+            usage.setdefault('first_token_seconds', round(time.perf_counter() - started, 3))
+            mark = time.perf_counter()
+            fields = parser.feed(text)
+            parse_seconds += time.perf_counter() - mark
+            yield from fields
+        self._report_usage(usage, contents, parser.text, started)
+        instrumentation.observe('gemini.json_parse', parse_seconds)
+        job_data = self._finish(prompt, parser)
+        yield from _unsent_fields(job_data, parser.fields)
+        if key:
+            cache.set(key, job_data)
+
+    async def _aiter_scheduled_text(self, contents, usage):
+        """Open and read a scheduled stream on one worker thread, handing chunks to the loop.
+
+        The scheduler sleeps while pacing and backing off, and a stream keeps
+        its model slot until drained. Reading chunk by chunk on whichever
+        thread is free could leave every thread waiting for a slot that only
+        an unread stream can give back, so one thread sees each stream through.
+        """
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+        stop = threading.Event()
+
+        def pump():
+            try:
+                with contextlib.closing(iter_response_text(self._send(contents, True), usage)) as texts:
+                    for text in texts:
+                        if stop.is_set():
+                            return
+                        loop.call_soon_threadsafe(queue.put_nowait, (text, None))
+                loop.call_soon_threadsafe(queue.put_nowait, (None, None))
+            except BaseException as e:
+                loop.call_soon_threadsafe(queue.put_nowait, (None, e))
+
+        worker = loop.run_in_executor(None, pump)
+        try:
+            while True:
+                text, error = await queue.get()
+                if error is not None:
+                    raise error
+                if text is None:
+                    break
+                yield text
+            await worker
+        finally:
+            # A cancelled or abandoned reader stops the worker at the next chunk, which closes the stream
+            stop.set()
+
+    async def _aiter_text(self, contents, usage):
+        if self.scheduler is not None:
+            async for text in self._aiter_scheduled_text(contents, usage):
+                yield text
+            return
+
+        model = self.model
+        if hasattr(model, 'generate_content_async'):
+            response = await model.generate_content_async(contents, stream=True, **self._request_kwargs())
+        else:
+            response = await asyncio.to_thread(model.generate_content, contents, **self._request_kwargs())
+        if hasattr(response, '__aiter__'):
+            async for chunk in response:
+                record_usage_metadata(usage, chunk)
+                text = _chunk_text(chunk)
+                if text:
+                    yield text
+        else:
+            for text in iter_response_text(response, usage):
+                yield text
+
+    async def astream_fields(self, prompt, cache=None):
+        """Async counterpart of stream_fields; the response cache may hit SQLite, so it is used from a worker thread"""
+        cache = cache or self.cache
+        key, job_data = await asyncio.to_thread(self._cached, prompt, cache)
+        if job_data is not None:
+            for item in job_data.items():
+                yield item
+            return
+
+        contents = self._contents(self.prompt_builder.user_content(prompt))
+        parser = JsonFieldStream()
+        usage, started = {'kind': 'generate'}, time.perf_counter()
+        parse_seconds = 0.0
+        async for text in self._aiter_text(contents, usage):
+            usage.setdefault('first_token_seconds', round(time.perf_counter() - started, 3))
+            mark = time.perf_counter()
+            fields = parser.feed(text)
+            parse_seconds += time.perf_counter() - mark
+            for item in fields:
+                yield item
+        self._report_usage(usage, contents, parser.text, started)
+        instrumentation.observe('gemini.json_parse', parse_seconds)
+        job_data = await asyncio.to_thread(self._finish, prompt, parser)
+        for item in _unsent_fields(job_data, parser.fields):
+            yield item
+        if key:
+            await asyncio.to_thread(cache.set, key, job_data)
+
+    def generate(self, prompt, cache=None):
+        return dict(self.stream_fields(prompt, cache))
+
+    async def generate_async(self, prompt, cache=None):
+        return {field: value async for field, value in self.astream_fields(prompt, cache)}
+
+_generators = {}
+_generators_lock = threading.Lock()
+
+def get_generator(api_key=None, structured=False, scheduler=None):
+    """Return the shared GeminiGenerator for an API key, mode and scheduler, creating it on first use"""
+    api_key = resolve_api_key(api_key)
+    key = (api_key, structured, scheduler)
+    generator = _generators.get(key)
+    if generator is None:
+        with _generators_lock:
+            generator = _generators.get(key)
+            if generator is None:
+                model_names = scheduler.model_names if scheduler else None
+                generator = _generators[key] = GeminiGenerator(api_key, model_names=model_names, structured=structured,
+                                                               scheduler=scheduler)
+    return generator
+
+def stream_with_gemini(prompt, api_key=None, cache=None, structured=False, scheduler=None):
+    """Generator of (key, value) pairs for each job description field as it arrives"""
+    return get_generator(api_key, structured, scheduler).stream_fields(prompt, cache=cache)
+
+def regenerate_with_gemini(job_data, keys, instruction='', api_key=None, structured=False, scheduler=None):
+    """Rewrite only the given sections of an existing job description and merge them into a copy of it"""
+    return get_generator(api_key, structured, scheduler).regenerate_fields(job_data, keys, instruction)
+
+def generate_with_gemini(prompt, api_key=None, cache=None, structured=False, scheduler=None):
+    with instrumentation.timer('gemini.generate'):
+        return dict(stream_with_gemini(prompt, api_key, cache, structured, scheduler))
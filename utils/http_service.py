@@ -0,0 +1,303 @@
+import asyncio
+import json
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from http import HTTPStatus
+
+from utils import instrumentation
+from utils.output_formats import get_output_renderer, render_formats
+
+CONTENT_TYPES = {
+    '.pdf': 'application/pdf',
+    '.html': 'text/html; charset=utf-8',
+    '.md': 'text/markdown; charset=utf-8',
+    '.txt': 'text/plain; charset=utf-8',
+}
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key into one running task.
+
+    Every caller awaits the shared task through ``asyncio.shield``, so one
+    caller timing out or disconnecting does not cancel it for the others;
+    the task is cancelled only when its last caller goes away.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self.coalesced = 0
+
+    def __len__(self):
+        return len(self._calls)
+
+    async def do(self, key, factory):
+        call = self._calls.get(key)
+        if call is None:
+            call = self._calls[key] = {'task': asyncio.ensure_future(factory()), 'waiters': 0}
+            call['task'].add_done_callback(lambda _: self._forget(key, call))
+        else:
+            self.coalesced += 1
+            instrumentation.count('service.coalesced')
+        call['waiters'] += 1
+        try:
+            return await asyncio.shield(call['task'])
+        finally:
+            call['waiters'] -= 1
+            if not call['waiters'] and not call['task'].done():
+                # Forget it right away so a new caller starts afresh instead of joining a cancelled task
+                self._forget(key, call)
+                call['task'].cancel()
+
+    def _forget(self, key, call):
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+def render_document(job_data, output_format='pdf', logo_path=None):
+    """Render one format; module-level so process pool workers can unpickle it"""
+    return render_formats(job_data, (output_format,), logo_path)[output_format]
+
+class JobDescriptionService:
+    """Asyncio HTTP/1.1 front end for generation and rendering.
+
+    Routes (JSON request bodies, one request per connection):
+
+        POST /generate         {"prompt": ...}                  -> job_data as JSON
+        POST /render           {"job_data": {...}, "format": ...} -> the document
+        POST /generate-render  {"prompt": ..., "format": ...}     -> the document
+        GET  /health           in-flight calls and counters
+        GET  /metrics          Prometheus text, when instrumentation is enabled
+
+    Generation runs on GeminiGenerator.generate_async and rendering in
+    ``render_processes`` spawned processes, or ``render_workers`` threads
+    when that is 0, so the event loop never renders; blocking upstream calls
+    use ``upstream_workers`` threads. Identical in-flight
+    prompts share one upstream call and identical renders one render. Each
+    request is limited to ``request_timeout`` seconds (504) and is cancelled
+    when the connection is lost (reset or aborted by the client); a render
+    already running in the executor still finishes, but its result is
+    dropped. A client that half-closes after sending still gets its reply.
+    """
+
+    def __init__(self, generator, cache=None, logo_path=None, request_timeout=120.0, render_workers=2, render_processes=0,
+                 upstream_workers=32, max_body_bytes=1024 * 1024, header_timeout=10.0):
+        self.generator = generator
+        self.cache = cache
+        self.logo_path = logo_path
+        self.request_timeout = request_timeout
+        self.max_body_bytes = max_body_bytes
+        self.header_timeout = header_timeout
+        if render_processes:
+            from utils.pdf_generator import apply_output_settings, get_output_settings
+            self.render_executor = ProcessPoolExecutor(render_processes, mp_context=multiprocessing.get_context('spawn'),
+                                                       initializer=apply_output_settings, initargs=get_output_settings())
+        else:
+            self.render_executor = ThreadPoolExecutor(max_workers=render_workers, thread_name_prefix='render')
+        # Scheduled and non-async model calls run via asyncio.to_thread; the loop's default pool is too small to serve many users
+        self.upstream_executor = ThreadPoolExecutor(max_workers=upstream_workers, thread_name_prefix='gemini')
+        self.flights = SingleFlight()
+        self.stats = {'requests': 0, 'errors': 0, 'timeouts': 0, 'cancelled': 0}
+        self._routes = {
+            ('POST', '/generate'): self._handle_generate,
+            ('POST', '/render'): self._handle_render,
+            ('POST', '/generate-render'): self._handle_generate_render,
+            ('GET', '/health'): self._handle_health,
+            ('GET', '/metrics'): self._handle_metrics,
+        }
+
+    async def generate(self, prompt):
+        key = ('generate', self.generator.cache_key(prompt))
+        return await self.flights.do(key, lambda: self.generator.generate_async(prompt, self.cache))
+
+    async def render(self, job_data, output_format='pdf'):
+        key = ('render', output_format, json.dumps(job_data, sort_keys=True))
+        loop = asyncio.get_running_loop()
+        return await self.flights.do(key, lambda: loop.run_in_executor(
+            self.render_executor, render_document, job_data, output_format, self.logo_path))
+
+    @staticmethod
+    def _field(body, name, kind, default=None):
+        value = body.get(name, default)
+        if not isinstance(value, kind) or (isinstance(value, str) and not value.strip()):
+            raise HttpError(HTTPStatus.BAD_REQUEST, f"'{name}' must be a non-empty {kind.__name__}")
+        return value
+
+    def _format(self, body):
+        name = self._field(body, 'format', str, 'pdf')
+        try:
+            return name, get_output_renderer(name)
+        except ValueError as e:
+            raise HttpError(HTTPStatus.BAD_REQUEST, str(e)) from None
+
+    async def _generated(self, prompt):
+        try:
+            return await self.generate(prompt)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            raise HttpError(HTTPStatus.BAD_GATEWAY, f"Generation failed: {e}") from e
+
+    async def _document(self, job_data, name, renderer):
+        content = await self.render(job_data, name)
+        if not renderer.binary:
+            content = content.encode('utf-8')
+        content_type = CONTENT_TYPES.get(renderer.extension, 'application/octet-stream')
+        return HTTPStatus.OK, content_type, content
+
+    async def _handle_generate(self, body):
+        job_data = await self._generated(self._field(body, 'prompt', str))
+        return HTTPStatus.OK, 'application/json', json.dumps(job_data, ensure_ascii=False).encode('utf-8')
+
+    async def _handle_render(self, body):
+        job_data = self._field(body, 'job_data', dict)
+        return await self._document(job_data, *self._format(body))
+
+    async def _handle_generate_render(self, body):
+        prompt = self._field(body, 'prompt', str)
+        name, renderer = self._format(body)
+        return await self._document(await self._generated(prompt), name, renderer)
+
+    async def _handle_health(self, body):
+        health = {'status': 'ok', 'in_flight': len(self.flights), 'coalesced': self.flights.coalesced, **self.stats}
+        return HTTPStatus.OK, 'application/json', json.dumps(health).encode('utf-8')
+
+    async def _handle_metrics(self, body):
+        recorder = instrumentation.get_recorder()
+        if recorder is None:
+            raise HttpError(HTTPStatus.NOT_FOUND, "Metrics are not enabled")
+        return HTTPStatus.OK, 'text/plain; version=0.0.4', recorder.to_prometheus().encode('utf-8')
+
+    async def _read_request(self, reader):
+        request_line = await reader.readline()
+        if not request_line:
+            return None
+        try:
+            method, target, _ = request_line.decode('latin-1').split()
+        except ValueError:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "Malformed request line") from None
+        headers = {}
+        while (line := await reader.readline()) not in (b'\r\n', b'\n', b''):
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get('content-length', 0))
+        except ValueError:
+            length = -1
+        if length < 0:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+        if length > self.max_body_bytes:
+            raise HttpError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"Request body is limited to {self.max_body_bytes} bytes")
+        body = await reader.readexactly(length) if length else b''
+        return method.upper(), target.split('?', 1)[0], body
+
+    async def _dispatch(self, method, path, body):
+        handler = self._routes.get((method, path))
+        if handler is None:
+            allowed = any(route_path == path for _, route_path in self._routes)
+            raise HttpError(HTTPStatus.METHOD_NOT_ALLOWED if allowed else HTTPStatus.NOT_FOUND, f"No route for {method} {path}")
+        try:
+            payload = json.loads(body) if body else {}
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            raise HttpError(HTTPStatus.BAD_REQUEST, "Request body must be JSON") from None
+        if not isinstance(payload, dict):
+            raise HttpError(HTTPStatus.BAD_REQUEST, "Request body must be a JSON object")
+        return await handler(payload)
+
+    @staticmethod
+    async def _connection_lost(writer):
+        try:
+            await writer.wait_closed()
+        except Exception:
+            pass
+
+    async def _until_done_or_disconnect(self, writer, work):
+        """Await ``work``, cancelling it if the transport reports the connection lost first.
+
+        EOF on the read side is not a disconnect: clients may half-close
+        their end once the request is sent and still read the response.
+        """
+        work = asyncio.ensure_future(work)
+        lost = asyncio.ensure_future(self._connection_lost(writer))
+        try:
+            await asyncio.wait({work, lost}, return_when=asyncio.FIRST_COMPLETED)
+            if not work.done():
+                work.cancel()
+                self.stats['cancelled'] += 1
+                instrumentation.count('service.cancelled')
+                return None
+            return work.result()
+        finally:
+            lost.cancel()
+
+    async def handle_connection(self, reader, writer):
+        start, route = time.perf_counter(), 'unknown'
+        try:
+            try:
+                request = await asyncio.wait_for(self._read_request(reader), self.header_timeout)
+                if request is None:
+                    return
+                method, path, body = request
+                self.stats['requests'] += 1
+                # Unknown paths share one label so scanners cannot blow up the metric's cardinality
+                route = path if (method, path) in self._routes else 'unknown'
+                response = await self._until_done_or_disconnect(
+                    writer, asyncio.wait_for(self._dispatch(method, path, body), self.request_timeout))
+                if response is None:
+                    return
+            except HttpError as e:
+                response = self._error(e.status, str(e))
+            except (asyncio.TimeoutError, TimeoutError):
+                self.stats['timeouts'] += 1
+                instrumentation.count('service.timeouts')
+                response = self._error(HTTPStatus.GATEWAY_TIMEOUT, "Request timed out")
+            except asyncio.IncompleteReadError:
+                return
+            except Exception as e:
+                response = self._error(HTTPStatus.INTERNAL_SERVER_ERROR, f"{type(e).__name__}: {e}")
+            await self._write_response(writer, *response)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            instrumentation.observe('service.request', time.perf_counter() - start, route=route)
+            writer.close()
+
+    def _error(self, status, message):
+        self.stats['errors'] += 1
+        return status, 'application/json', json.dumps({'error': message}).encode('utf-8')
+
+    @staticmethod
+    async def _write_response(writer, status, content_type, content):
+        status = HTTPStatus(status)
+        head = (f"HTTP/1.1 {status.value} {status.phrase}\r\nContent-Type: {content_type}\r\n"
+                f"Content-Length: {len(content)}\r\nConnection: close\r\n\r\n")
+        writer.write(head.encode('latin-1') + content)
+        await writer.drain()
+
+    async def start(self, host='127.0.0.1', port=8080):
+        """Start listening and return the asyncio server; port 0 picks a free port"""
+        asyncio.get_running_loop().set_default_executor(self.upstream_executor)
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    def close(self):
+        self.render_executor.shutdown(wait=False, cancel_futures=True)
+        self.upstream_executor.shutdown(wait=False, cancel_futures=True)
+
+def run_service(service, host='127.0.0.1', port=8080):
+    """Serve until interrupted"""
+    async def _serve():
+        server = await service.start(host, port)
+        address = server.sockets[0].getsockname()
+        print(f"🌐 Serving on http://{address[0]}:{address[1]} (Ctrl+C to stop)")
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(_serve())
+    except KeyboardInterrupt:
+        print("\n👋 Server stopped")
+    finally:
+        service.close()
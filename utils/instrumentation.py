@@ -0,0 +1,152 @@
+import json
+import threading
+import time
+from contextlib import nullcontext
+
+_NULL_TIMER = nullcontext()
+
+class MetricsRecorder:
+    """Thread-safe collector of stage timings and counters.
+
+    Every observation is also passed to the registered hooks as an event dict
+    (``type``, ``name``, ``value``, ``labels``, ``time``), so callers can
+    forward it anywhere; JsonlExporter is one such hook. ``to_prometheus``
+    renders the totals in the Prometheus text exposition format.
+    """
+
+    def __init__(self, prefix='jobdesc'):
+        self.prefix = prefix
+        self.timings = {}
+        self.counters = {}
+        self.hooks = []
+        self._lock = threading.Lock()
+
+    def add_hook(self, hook):
+        self.hooks.append(hook)
+        return hook
+
+    def _emit(self, kind, name, value, labels):
+        event = {'type': kind, 'name': name, 'value': value, 'labels': labels, 'time': time.time()}
+        for hook in self.hooks:
+            hook(event)
+
+    def observe(self, name, seconds, labels=None):
+        key = (name, tuple(sorted((labels or {}).items())))
+        with self._lock:
+            entry = self.timings.get(key)
+            if entry is None:
+                entry = self.timings[key] = {'count': 0, 'sum': 0.0, 'max': 0.0}
+            entry['count'] += 1
+            entry['sum'] += seconds
+            entry['max'] = max(entry['max'], seconds)
+        if self.hooks:
+            self._emit('timing', name, seconds, labels or {})
+
+    def count(self, name, amount=1, labels=None):
+        key = (name, tuple(sorted((labels or {}).items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+        if self.hooks:
+            self._emit('count', name, amount, labels or {})
+
+    def snapshot(self):
+        """Plain-dict copy of the totals, keyed by metric name with labels appended"""
+        def label(name, labels):
+            return name + ''.join(f"[{k}={v}]" for k, v in labels)
+        with self._lock:
+            return {'timings': {label(*key): dict(entry) for key, entry in self.timings.items()},
+                    'counters': {label(*key): value for key, value in self.counters.items()}}
+
+    def _metric_name(self, name, suffix):
+        return f"{self.prefix}_{name.replace('.', '_').replace('-', '_')}_{suffix}"
+
+    @staticmethod
+    def _labels(labels):
+        if not labels:
+            return ''
+        return '{' + ','.join(f'{k}="{v}"' for k, v in labels) + '}'
+
+    def to_prometheus(self):
+        lines = []
+        with self._lock:
+            timings = sorted(self.timings.items())
+            counters = sorted(self.counters.items())
+        declared = set()
+        for (name, labels), entry in timings:
+            metric = self._metric_name(name, 'seconds')
+            if metric not in declared:
+                declared.add(metric)
+                lines.append(f"# TYPE {metric} summary")
+            lines.append(f"{metric}_count{self._labels(labels)} {entry['count']}")
+            lines.append(f"{metric}_sum{self._labels(labels)} {entry['sum']:.6f}")
+        for (name, labels), value in counters:
+            metric = self._metric_name(name, 'total')
+            if metric not in declared:
+                declared.add(metric)
+                lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric}{self._labels(labels)} {value}")
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.to_prometheus())
+
+class JsonlExporter:
+    """Hook that appends every metrics event to a JSON lines file"""
+
+    def __init__(self, path):
+        self._file = open(path, 'a', encoding='utf-8')
+        self._lock = threading.Lock()
+
+    def __call__(self, event):
+        line = json.dumps(event)
+        with self._lock:
+            self._file.write(line + '\n')
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+class _Timer:
+    __slots__ = ('recorder', 'name', 'labels', 'start')
+
+    def __init__(self, recorder, name, labels):
+        self.recorder, self.name, self.labels = recorder, name, labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.recorder.observe(self.name, time.perf_counter() - self.start, self.labels)
+        return False
+
+_recorder = None
+
+def enable(recorder=None):
+    """Start recording into ``recorder`` (a new MetricsRecorder by default) and return it"""
+    global _recorder
+    _recorder = recorder or MetricsRecorder()
+    return _recorder
+
+def disable():
+    global _recorder
+    _recorder = None
+
+def get_recorder():
+    return _recorder
+
+def timer(name, **labels):
+    """Context manager timing a stage; a shared no-op while instrumentation is disabled"""
+    if _recorder is None:
+        return _NULL_TIMER
+    return _Timer(_recorder, name, labels)
+
+def observe(name, seconds, **labels):
+    if _recorder is not None:
+        _recorder.observe(name, seconds, labels)
+
+def count(name, amount=1, **labels):
+    if _recorder is not None:
+        _recorder.count(name, amount, labels)
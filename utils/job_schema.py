@@ -0,0 +1,73 @@
+# Fields the PDF renderer consumes, shared by prompt-side schema validation
+METADATA_ITEMS = [
+    ('team', 'Team'),
+    ('location', 'Location'),
+    ('reporting_to', 'Reporting To'),
+    ('employment_type', 'Employment Type'),
+    ('experience_required', 'Experience Required'),
+    ('salary_range', 'Salary Range'),
+    ('office_timings', 'Office Timings'),
+    ('working_days', 'Working Days'),
+    ('work_schedule', 'Work Schedule')
+]
+
+SECTIONS = [
+    ('company_overview', 'Company Overview'),
+    ('role_overview', 'Role Overview'),
+    ('key_responsibilities', 'Key Responsibilities'),
+    ('technical_requirements', 'Technical Requirements'),
+    ('who_you_are', 'Who You Are'),
+    ('experience_skills', 'Experience & Skills'),
+    ('qualifications', 'Required Qualifications'),
+    ('preferred_qualifications', 'Preferred Qualifications'),
+    ('what_we_offer', 'What We Offer'),
+    ('benefits', 'Benefits & Perks'),
+    ('application_process', 'Application Process')
+]
+
+HEADER_FIELDS = ['company_name', 'job_title', 'job_code', 'department', 'industry_type', 'company_website']
+
+# Sections the prompt asks for as lists of "Title: description" strings; the rest are plain strings
+LIST_FIELDS = ['key_responsibilities', 'technical_requirements', 'who_you_are', 'experience_skills', 'qualifications',
+               'preferred_qualifications', 'what_we_offer', 'benefits']
+
+REQUIRED_FIELDS = ['job_title']
+
+def schema_fields():
+    """Every field the generator is asked for, in prompt order"""
+    fields = list(HEADER_FIELDS)
+    for key, _ in METADATA_ITEMS + SECTIONS:
+        if key not in fields and key != 'work_schedule':
+            fields.append(key)
+    return fields
+
+def response_schema(fields=None):
+    """OpenAPI-style schema for Gemini's constrained JSON output, optionally limited to some fields"""
+    properties = {}
+    for key in fields or schema_fields():
+        if key in LIST_FIELDS:
+            properties[key] = {'type': 'ARRAY', 'items': {'type': 'STRING'}}
+        else:
+            properties[key] = {'type': 'STRING'}
+    return {'type': 'OBJECT', 'properties': properties, 'required': [key for key in REQUIRED_FIELDS if key in properties]}
+
+def validate_job_data(data):
+    """Map each field that would render incorrectly to the problem found; empty when valid"""
+    if not isinstance(data, dict):
+        return {None: f"Expected a JSON object, got {type(data).__name__}"}
+    problems = {}
+    string_fields = set(schema_fields()) - set(LIST_FIELDS)
+    for key in REQUIRED_FIELDS:
+        value = data.get(key)
+        if not isinstance(value, str) or not value.strip():
+            problems[key] = f"Missing required field '{key}'"
+    for key, value in data.items():
+        if value is None:
+            continue
+        if key in LIST_FIELDS:
+            # The renderer also understands the older dict shapes for these sections
+            if not isinstance(value, (list, dict, str)):
+                problems[key] = f"Field '{key}' should be a list, got {type(value).__name__}"
+        elif key in string_fields and not isinstance(value, (str, int, float)):
+            problems[key] = f"Field '{key}' should be a string, got {type(value).__name__}"
+    return problems
@@ -0,0 +1,99 @@
+import json
+import re
+
+_FENCE = re.compile(r'^\s*```[A-Za-z]*\s*|\s*```\s*$')
+# A complete value at the end of a line followed by the next key on a later line
+_MISSING_COMMA = re.compile(r'(["\]}]|\d|true|false|null)(\s*\n\s*)(?="[^"\n]*"\s*:)')
+_TRAILING_COMMA = re.compile(r',(\s*[}\]])')
+
+class JsonRepairError(ValueError):
+    pass
+
+def _strip_wrapping(text):
+    text = _FENCE.sub('', text.strip())
+    start = text.find('{')
+    return text[start:] if start > 0 else text
+
+def _close_truncated(text):
+    """Close an unterminated string, drop a dangling partial member and close open brackets"""
+    stack, in_string, escaped = [], False, False
+    last_safe = 0
+    for index, char in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+            continue
+        if char == '"':
+            in_string = True
+        elif char in '[{':
+            stack.append('}' if char == '{' else ']')
+        elif char in ']}':
+            if stack:
+                stack.pop()
+            last_safe = index + 1
+        elif char == ',':
+            last_safe = index
+    if not stack:
+        return text
+
+    closed = text + ''.join(reversed(stack))
+    if not in_string:
+        try:
+            json.loads(closed)
+            return closed
+        except json.JSONDecodeError:
+            pass
+
+    # Cut back to the last complete member, dropping a half-written string, and close that prefix
+    prefix = text[:last_safe].rstrip().rstrip(',')
+    closers, in_string, escaped = [], False, False
+    for char in prefix:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in '[{':
+            closers.append('}' if char == '{' else ']')
+        elif char in ']}' and closers:
+            closers.pop()
+    return prefix + ''.join(reversed(closers))
+
+# Applied in order; each step only runs if the text still fails to parse
+_REPAIRS = [
+    ('strip_wrapping', _strip_wrapping),
+    ('missing_commas', lambda text: _MISSING_COMMA.sub(r'\1,\2', text)),
+    ('trailing_commas', lambda text: _TRAILING_COMMA.sub(r'\1', text)),
+    ('truncation', _close_truncated),
+]
+
+def repair_json(text):
+    """Parse model output, fixing common defects on the way.
+
+    Returns ``(value, repairs)`` where ``repairs`` names each fix that changed
+    the text. Raises JsonRepairError when the text cannot be recovered.
+    """
+    repairs = []
+    try:
+        return json.loads(text), repairs
+    except json.JSONDecodeError as e:
+        error = e
+    for name, repair in _REPAIRS:
+        repaired = repair(text)
+        if repaired == text:
+            continue
+        text = repaired
+        repairs.append(name)
+        try:
+            return json.loads(text), repairs
+        except json.JSONDecodeError as e:
+            error = e
+    raise JsonRepairError(f"Failed to parse Gemini response as JSON: {error}")
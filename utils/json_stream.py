@@ -0,0 +1,167 @@
+import json
+import re
+
+_WHITESPACE = ' \t\r\n'
+_STRING_SPECIAL = re.compile(r'["\\]')
+_STRUCTURAL = re.compile(r'["\[\]{},]')
+
+class JsonFieldStream:
+    """Incremental parser for a streamed JSON object.
+
+    Text is fed in arbitrary chunks; each call to ``feed`` returns the
+    ``(key, value)`` pairs whose values became complete, in document order.
+    Anything before the opening brace (such as a ```json fence) is ignored,
+    and a missing comma between two top-level fields is tolerated and noted
+    in ``repairs``. Fields whose value fails to parse are recorded in
+    ``errors`` instead of emitted.
+    """
+
+    def __init__(self):
+        self.text = ''
+        self.fields = {}
+        self.errors = {}
+        self.repairs = []
+        self.done = False
+        self._pos = 0
+        self._state = 'start'
+        self._key = None
+        self._value_start = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._value_closed = False
+
+    def feed(self, chunk):
+        self.text += chunk
+        completed = []
+        while not self.done:
+            if not self._step(completed):
+                break
+        return completed
+
+    def _skip_whitespace(self):
+        while self._pos < len(self.text) and self.text[self._pos] in _WHITESPACE:
+            self._pos += 1
+        return self._pos < len(self.text)
+
+    def _step(self, completed):
+        """Advance one state; returns False when more input is needed"""
+        if self._state == 'start':
+            brace = self.text.find('{', self._pos)
+            if brace == -1:
+                self._pos = len(self.text)
+                return False
+            self._pos = brace + 1
+            self._state = 'key'
+            return True
+
+        if self._state == 'key':
+            while self._skip_whitespace() and self.text[self._pos] == ',':
+                self._pos += 1
+            if self._pos >= len(self.text):
+                return False
+            char = self.text[self._pos]
+            if char == '}':
+                self._pos += 1
+                self.done = True
+                return False
+            if char != '"':
+                # Not a key; skip the stray character rather than stall the stream
+                self._pos += 1
+                return True
+            end = self._string_end(self._pos + 1)
+            if end == -1:
+                return False
+            self._key = json.loads(self.text[self._pos:end + 1])
+            self._pos = end + 1
+            self._state = 'colon'
+            return True
+
+        if self._state == 'colon':
+            if not self._skip_whitespace():
+                return False
+            if self.text[self._pos] == ':':
+                self._pos += 1
+            self._state = 'value'
+            self._value_start = self._pos
+            self._depth, self._in_string, self._escaped, self._value_closed = 0, False, False, False
+            return True
+
+        # self._state == 'value'
+        text = self.text
+        while self._pos < len(text):
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                    self._pos += 1
+                    continue
+                match = _STRING_SPECIAL.search(text, self._pos)
+                if match is None:
+                    self._pos = len(text)
+                    break
+                self._pos = match.start()
+                if text[self._pos] == '\\':
+                    self._escaped = True
+                else:
+                    self._in_string = False
+                    if self._depth == 0:
+                        self._value_closed = True
+                self._pos += 1
+                continue
+
+            match = _STRUCTURAL.search(text, self._pos)
+            if match is None:
+                self._pos = len(text)
+                break
+            self._pos = match.start()
+            char = text[self._pos]
+            if char == '"':
+                if self._depth == 0 and self._value_closed:
+                    # Missing comma: the next key starts right after a complete value
+                    if 'missing_commas' not in self.repairs:
+                        self.repairs.append('missing_commas')
+                    self._emit(completed, self._pos)
+                    self._state = 'key'
+                    return True
+                self._in_string = True
+            elif char in '[{':
+                self._depth += 1
+            elif char in ']}':
+                if self._depth == 0:
+                    self._emit(completed, self._pos)
+                    self._pos += 1
+                    self.done = True
+                    return False
+                self._depth -= 1
+                if self._depth == 0:
+                    self._value_closed = True
+            elif self._depth == 0:
+                # A top-level comma ends the value
+                self._emit(completed, self._pos)
+                self._pos += 1
+                self._state = 'key'
+                return True
+            self._pos += 1
+        return False
+
+    def _string_end(self, start):
+        escaped = False
+        for index in range(start, len(self.text)):
+            char = self.text[index]
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                return index
+        return -1
+
+    def _emit(self, completed, end):
+        raw = self.text[self._value_start:end].strip()
+        try:
+            value = json.loads(raw)
+        except json.JSONDecodeError as e:
+            self.errors[self._key] = str(e)
+            return
+        self.fields[self._key] = value
+        completed.append((self._key, value))
@@ -0,0 +1,134 @@
+import hashlib
+import io
+import os
+import threading
+from collections import OrderedDict
+from PIL import Image
+from reportlab.lib.units import inch
+from reportlab.lib.utils import ImageReader
+
+# Box the page header draws the logo into, see make_page_decorator
+LOGO_BOX = (1.4*inch, 0.6*inch)
+
+class JpegLogoReader(ImageReader):
+    """ImageReader over encoded JPEG bytes that ReportLab embeds as-is.
+
+    Each call to jpeg_fh gets its own stream, so one reader can be shared by
+    documents rendering on different threads.
+    """
+
+    def __init__(self, jpeg_bytes, ident=None):
+        ImageReader.__init__(self, io.BytesIO(jpeg_bytes), ident)
+        self._jpeg_bytes = jpeg_bytes
+        # ImageReader sets an instance attribute jpeg_fh returning its one shared stream; replace it
+        self.jpeg_fh = self._new_jpeg_fh
+
+    def _new_jpeg_fh(self):
+        return io.BytesIO(self._jpeg_bytes)
+
+def _has_transparency(image):
+    return image.mode in ('RGBA', 'LA', 'PA') or (image.mode == 'P' and 'transparency' in image.info)
+
+def load_logo(logo_path, box_size=LOGO_BOX, dpi=300, quality=90):
+    """Decode a logo once and shrink it to the pixels the header box can actually show"""
+    with open(logo_path, 'rb') as f:
+        raw = f.read()
+    image = Image.open(io.BytesIO(raw))
+    image.load()
+    max_size = (max(1, int(box_size[0] / inch * dpi)), max(1, int(box_size[1] / inch * dpi)))
+    needs_resize = image.width > max_size[0] or image.height > max_size[1]
+
+    if _has_transparency(image):
+        # Keep the alpha channel for mask='auto'; ReportLab Flate-compresses these itself
+        image = image.convert('RGBA')
+        if needs_resize:
+            image.thumbnail(max_size, Image.LANCZOS)
+        return ImageReader(image)
+
+    if image.format == 'JPEG' and image.mode in ('RGB', 'L', 'CMYK') and not needs_resize:
+        return JpegLogoReader(raw, logo_path)
+
+    image = image.convert('RGB')
+    if needs_resize:
+        image.thumbnail(max_size, Image.LANCZOS)
+    encoded = io.BytesIO()
+    image.save(encoded, format='JPEG', quality=quality, optimize=True)
+    return JpegLogoReader(encoded.getvalue(), logo_path)
+
+class LogoCache:
+    """Bounded LRU of decoded, pre-scaled logos keyed by path, size and modification time"""
+
+    def __init__(self, max_entries=32, box_size=LOGO_BOX, dpi=300):
+        self.max_entries = max_entries
+        self.box_size = box_size
+        self.dpi = dpi
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+        self._entries = OrderedDict()
+        self._digests = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, logo_path):
+        """Return an ImageReader for logo_path, or None if it is missing or unreadable"""
+        try:
+            stat = os.stat(logo_path)
+        except (OSError, TypeError, ValueError):
+            return None
+        key = (os.path.abspath(logo_path), stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            reader = self._entries.get(key)
+            if reader is not None:
+                self._entries.move_to_end(key)
+                self.stats['hits'] += 1
+                return reader
+            self.stats['misses'] += 1
+
+        try:
+            reader = load_logo(logo_path, self.box_size, self.dpi)
+        except Exception:
+            return None
+
+        with self._lock:
+            self._entries[key] = reader
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats['evictions'] += 1
+        return reader
+
+    def digest(self, logo_path):
+        """SHA-256 of the logo file's bytes, or None if it is missing; remembered per path, size and modification time"""
+        try:
+            stat = os.stat(logo_path)
+        except (OSError, TypeError, ValueError):
+            return None
+        key = (os.path.abspath(logo_path), stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            digest = self._digests.get(key)
+        if digest is None:
+            try:
+                with open(logo_path, 'rb') as f:
+                    digest = hashlib.sha256(f.read()).hexdigest()
+            except OSError:
+                return None
+            with self._lock:
+                self._digests[key] = digest
+                while len(self._digests) > self.max_entries:
+                    self._digests.popitem(last=False)
+        return digest
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._digests.clear()
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+def get_logo_cache():
+    """Return the process-wide LogoCache shared by every renderer"""
+    global _default_cache
+    if _default_cache is None:
+        with _default_cache_lock:
+            if _default_cache is None:
+                _default_cache = LogoCache()
+    return _default_cache
@@ -0,0 +1,173 @@
+import html
+import os
+from utils import instrumentation
+from utils.document_model import JobDocument, normalize_job_data
+
+class HtmlRenderer:
+    """Self-contained HTML fragment: an <article> with one <section> per job description section"""
+
+    extension = '.html'
+    binary = False
+
+    def render(self, document, logo_path=None):
+        esc = html.escape
+        parts = ['<article class="job-description">', f"<h1>{esc(str(document.title))}</h1>"]
+        if document.metadata:
+            parts.append('<ul class="job-meta">')
+            parts.extend(f"<li><strong>{esc(label)}:</strong> {esc(value)}</li>" for label, value in document.metadata)
+            parts.append('</ul>')
+        for section in document.sections:
+            parts.append(f'<section id="{section.key}">')
+            parts.append(f"<h2>{esc(section.title)}</h2>")
+            in_list = False
+            for block in section.blocks:
+                if block.kind == 'bullet' and not in_list:
+                    parts.append('<ul>')
+                elif block.kind != 'bullet' and in_list:
+                    parts.append('</ul>')
+                in_list = block.kind == 'bullet'
+                if block.kind == 'bullet':
+                    title = f"<strong>{esc(block.title)}:</strong> " if block.title is not None else ''
+                    parts.append(f"<li>{title}{esc(block.text)}</li>")
+                elif block.kind == 'label':
+                    parts.append(f"<p><strong>{esc(block.text)}</strong></p>")
+                else:
+                    parts.append(f"<p>{esc(block.text)}</p>")
+            if in_list:
+                parts.append('</ul>')
+            parts.append('</section>')
+        if document.company_name and document.company_website:
+            website = document.company_website
+            href = website if '://' in website else f"https://{website}"
+            parts.append(f'<footer><strong>{esc(document.company_name)}</strong> '
+                         f'<a href="{esc(href, quote=True)}">{esc(website)}</a></footer>')
+        parts.append('</article>')
+        return '\n'.join(parts) + '\n'
+
+class MarkdownRenderer:
+    extension = '.md'
+    binary = False
+
+    def render(self, document, logo_path=None):
+        lines = [f"# {document.title}", '']
+        if document.metadata:
+            lines.extend(f"- **{label}:** {value}" for label, value in document.metadata)
+            lines.append('')
+        for section in document.sections:
+            lines.extend([f"## {section.title}", ''])
+            previous = None
+            for block in section.blocks:
+                if previous is not None and (block.kind != 'bullet' or previous != 'bullet'):
+                    lines.append('')
+                if block.kind == 'bullet':
+                    title = f"**{block.title}:** " if block.title is not None else ''
+                    lines.append(f"- {title}{block.text}".rstrip())
+                elif block.kind == 'label':
+                    lines.append(f"**{block.text}**")
+                else:
+                    lines.append(block.text)
+                previous = block.kind
+            lines.append('')
+        if document.company_name and document.company_website:
+            lines.append(f"---\n**{document.company_name}** · {document.company_website}")
+        return '\n'.join(lines).rstrip() + '\n'
+
+def wrap_words(text, width, indent='', subsequent_indent=''):
+    """Greedy word wrap; textwrap handles far more cases and is an order of magnitude slower"""
+    lines, words = [], []
+    prefix, length = indent, len(indent) - 1
+    for word in text.split():
+        if words and length + 1 + len(word) > width:
+            lines.append(prefix + ' '.join(words))
+            words, prefix, length = [], subsequent_indent, len(subsequent_indent) - 1
+        words.append(word)
+        length += 1 + len(word)
+    if words:
+        lines.append(prefix + ' '.join(words))
+    return lines
+
+class PlainTextRenderer:
+    """Plain text wrapped to ``width`` columns, for job boards that accept no markup"""
+
+    extension = '.txt'
+    binary = False
+
+    def __init__(self, width=80):
+        self.width = width
+
+    def render(self, document, logo_path=None):
+        title = str(document.title)
+        lines = [title, '=' * len(title)]
+        lines.extend(f"{label}: {value}" for label, value in document.metadata)
+        for section in document.sections:
+            lines.extend(['', section.title.upper(), '-' * len(section.title)])
+            for block in section.blocks:
+                if block.kind == 'bullet':
+                    text = f"{block.title}: {block.text}".rstrip() if block.title is not None else block.text
+                    lines.extend(wrap_words(text, self.width, '* ', '  ') or ['*'])
+                else:
+                    lines.extend(wrap_words(block.text, self.width))
+        if document.company_name and document.company_website:
+            lines.extend(['', f"{document.company_name} - {document.company_website}"])
+        return '\n'.join(lines) + '\n'
+
+class PdfRenderer:
+    extension = '.pdf'
+    binary = True
+
+    def render(self, document, logo_path=None):
+        # ReportLab is only imported when a PDF is actually requested
+        from utils.pdf_generator import create_job_description_pdf_bytes
+        return create_job_description_pdf_bytes(document, logo_path)
+
+    def write(self, path, document, logo_path=None):
+        from utils.pdf_generator import create_job_description_pdf
+        create_job_description_pdf(path, document, logo_path)
+
+RENDERERS = {
+    'pdf': PdfRenderer(),
+    'html': HtmlRenderer(),
+    'markdown': MarkdownRenderer(),
+    'text': PlainTextRenderer(),
+}
+
+def register_renderer(name, renderer):
+    """Add an output format; renderers need ``extension``, ``binary`` and ``render(document, logo_path=None)``"""
+    RENDERERS[name] = renderer
+
+def get_output_renderer(name):
+    try:
+        return RENDERERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown output format '{name}'. Available formats: {', '.join(RENDERERS)}") from None
+
+def render_formats(data, formats=('pdf',), logo_path=None):
+    """Normalize job_data once and return {format: bytes or str} for every requested format"""
+    document = data if isinstance(data, JobDocument) else normalize_job_data(data)
+    results = {}
+    for name in formats:
+        with instrumentation.timer('document.render', format=name):
+            results[name] = get_output_renderer(name).render(document, logo_path)
+    return results
+
+def write_formats(output_path, data, formats=('pdf',), logo_path=None):
+    """Write each format next to output_path, swapping in the format's extension; returns the paths written"""
+    document = data if isinstance(data, JobDocument) else normalize_job_data(data)
+    base = os.path.splitext(output_path)[0]
+    paths = []
+    # Resolve every format up front so an unknown one fails before anything is written
+    for name, renderer in [(name, get_output_renderer(name)) for name in formats]:
+        path = base + renderer.extension
+        with instrumentation.timer('document.render', format=name):
+            if hasattr(renderer, 'write'):
+                renderer.write(path, document, logo_path)
+            else:
+                content = renderer.render(document, logo_path)
+                if renderer.binary:
+                    with open(path, 'wb') as f:
+                        f.write(content)
+                else:
+                    with open(path, 'w', encoding='utf-8') as f:
+                        f.write(content)
+        paths.append(path)
+    return paths
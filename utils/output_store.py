@@ -0,0 +1,75 @@
+import os
+import shutil
+import tempfile
+import threading
+
+class OutputStore:
+    """Content-addressed directory of rendered documents.
+
+    Each artifact lives at ``<root>/<key[:2]>/<key><extension>``, where the
+    key is a hash of everything that went into the render (see
+    JobDescriptionRenderer.render_key), so a repeat posting is served from
+    disk instead of being rendered again. Entries are written atomically
+    and never modified afterwards. Exports to a path are hard links when
+    the output is on the same filesystem, so replace those files rather
+    than rewriting them in place; the renderer itself never writes through
+    a hard link.
+    """
+
+    def __init__(self, root, extension='.pdf', link=True):
+        self.root = root
+        self.extension = extension
+        self.link = link
+        self.stats = {'hits': 0, 'misses': 0, 'stored': 0, 'linked': 0, 'copied': 0}
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def path_for(self, key):
+        return os.path.join(self.root, key[:2], key + self.extension)
+
+    def get(self, key):
+        """Return the stored artifact's path, or None if this key was never stored"""
+        path = self.path_for(key)
+        found = os.path.isfile(path)
+        with self._lock:
+            self.stats['hits' if found else 'misses'] += 1
+        return path if found else None
+
+    def put(self, key, content):
+        """Store bytes under key and return the artifact's path; a concurrent put of the same key is harmless"""
+        path = self.path_for(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        with self._lock:
+            self.stats['stored'] += 1
+        return path
+
+    def export(self, path, output):
+        """Hard-link (or copy) a stored artifact to a filesystem path, or write it into a binary stream"""
+        if not isinstance(output, (str, os.PathLike)):
+            with open(path, 'rb') as f:
+                shutil.copyfileobj(f, output)
+            return
+        if os.path.exists(output):
+            if os.path.samefile(path, output):
+                return
+            os.remove(output)
+        if self.link:
+            try:
+                os.link(path, output)
+                with self._lock:
+                    self.stats['linked'] += 1
+                return
+            except OSError:
+                # Different filesystem, or one without hard links
+                pass
+        shutil.copyfile(path, output)
+        with self._lock:
+            self.stats['copied'] += 1
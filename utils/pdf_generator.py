@@ -1,10 +1,26 @@
+import copy
+import hashlib
+import io
+import json
 import os
+import threading
+from collections import OrderedDict
+from reportlab import Version as REPORTLAB_VERSION
 from reportlab.lib.pagesizes import letter
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, HRFlowable
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle, StyleSheet1
 from reportlab.lib.enums import TA_LEFT, TA_RIGHT, TA_CENTER
 from reportlab.lib import colors
 from reportlab.lib.units import inch
+from utils import instrumentation
+from utils.document_model import JobDocument, bullet_blocks, has_content, normalize_job_data
+from utils.logo_cache import get_logo_cache
+
+# Bump whenever styles, layout or page decoration change, so stored reproducible renders are not reused
+TEMPLATE_VERSION = '1'
+
+# SimpleDocTemplate's default frame pads each side by 6pt, so paragraphs are laid out this much narrower than doc.width
+FRAME_PADDING = 6
 
 def setup_pdf_styles():
     styles = getSampleStyleSheet()
@@ -20,40 +36,58 @@ def setup_pdf_styles():
     
     return styles
 
-def has_content(value):
-    if value is None: 
-        return False
-    if isinstance(value, str): 
-        return value.strip() != ""
-    if isinstance(value, (list, tuple)): 
-        return any(has_content(item) for item in value)
-    if isinstance(value, dict): 
-        return any(has_content(v) for v in value.values())
-    return bool(value)
+def derive_compact_styles(styles, reduction=1):
+    """Return a new style sheet with smaller body and header fonts, leaving styles untouched"""
+    compact = StyleSheet1()
+    aliases = {style.name: alias for alias, style in styles.byAlias.items()}
+    for name, style in styles.byName.items():
+        compact_style = copy.copy(style)
+        if name in ['BodyTextStyle', 'BulletContentStyle', 'BulletTitleStyle', 'JobMetaStyle']:
+            compact_style.fontSize = max(8, style.fontSize - reduction)
+            compact_style.leading = max(compact_style.fontSize + 1, style.leading - reduction)
+        elif name == 'SectionHeaderStyle':
+            compact_style.fontSize = max(10, style.fontSize - reduction)
+            compact_style.leading = max(compact_style.fontSize + 1, style.leading - reduction)
+        compact.add(compact_style, alias=aliases.get(name))
+    return compact
+
+class CachedParagraph(Paragraph):
+    """Paragraph that remembers its line breaks per width, so measuring it before doc.build is not repeated during the build"""
+
+    def wrap(self, availWidth, availHeight):
+        cached = self.__dict__.setdefault('_wrap_cache', {}).get(availWidth)
+        if cached is not None:
+            self.width, self._wrapWidths, self.blPara, self.height = cached
+            return self.width, self.height
+        width, height = Paragraph.wrap(self, availWidth, availHeight)
+        if hasattr(self, 'blPara'):
+            self._wrap_cache[availWidth] = (self.width, self._wrapWidths, self.blPara, self.height)
+        return width, height
 
 def format_bullet_content(content_list, styles):
-    formatted_content = []
-    for item in content_list:
-        if not has_content(item): 
-            continue
-        if isinstance(item, str):
-            if ':' in item:
-                parts = item.split(':', 1)
-                title, content = parts[0].strip(), parts[1].strip()
-                formatted_content.append(Paragraph(f"● <b>{title}:</b>", styles['BulletTitleStyle']))
-                if has_content(content):
-                    formatted_content.append(Paragraph(content, styles['BulletContentStyle']))
+    return block_flowables(bullet_blocks(content_list), styles)
+
+def block_flowables(blocks, styles):
+    flowables = []
+    for block in blocks:
+        if block.kind == 'bullet':
+            if block.title is not None:
+                flowables.append(CachedParagraph(f"● <b>{block.title}:</b>", styles['BulletTitleStyle']))
+                if block.text:
+                    flowables.append(CachedParagraph(block.text, styles['BulletContentStyle']))
             else:
-                formatted_content.append(Paragraph(f"● {item}", styles['BulletTitleStyle']))
+                flowables.append(CachedParagraph(f"● {block.text}", styles['BulletTitleStyle']))
+        elif block.kind == 'label':
+            flowables.append(CachedParagraph(f"<b>{block.text}</b>", styles['BodyTextStyle']))
         else:
-            formatted_content.append(Paragraph(f"● {str(item)}", styles['BulletTitleStyle']))
-    return formatted_content
+            flowables.append(CachedParagraph(block.text, styles['BodyTextStyle']))
+    return flowables
 
-def create_job_description_pdf(output_filename, data, logo_path=None):
-    doc = SimpleDocTemplate(output_filename, pagesize=letter, topMargin=1.4*inch, bottomMargin=1.2*inch, leftMargin=1*inch, rightMargin=1*inch)
-    styles = setup_pdf_styles()
-    content = []
-    company_name = data.get('company_name', '')
+def make_page_decorator(data, logo_path=None, logo_cache=None):
+    document = data if isinstance(data, JobDocument) else normalize_job_data(data)
+    company_name, company_website = document.company_name, document.company_website
+    # Resolve the logo once per document; the cache shares the decoded image across documents
+    logo = (logo_cache or get_logo_cache()).get(logo_path) if logo_path else None
 
     def _draw_page_elements(canvas, doc_local):
         try:
@@ -62,7 +96,6 @@ def create_job_description_pdf(output_filename, data, logo_path=None):
             logo_width, logo_height = 1.4*inch, 0.6*inch
             frame_top_y = page_height - margin_top
             padding_right = 0.2*inch
-            company_website = data.get('company_website', '')
             
             canvas.saveState()
             
@@ -95,9 +128,9 @@ def create_job_description_pdf(output_filename, data, logo_path=None):
                 logo_y = frame_top_y
 
             # Draw logo if available
-            if logo_path and os.path.exists(logo_path):
+            if logo is not None:
                 try:
-                    canvas.drawImage(logo_path, logo_x, logo_y, width=logo_width, height=logo_height, preserveAspectRatio=True, mask='auto')
+                    canvas.drawImage(logo, logo_x, logo_y, width=logo_width, height=logo_height, preserveAspectRatio=True, mask='auto')
                 except: 
                     pass
 
@@ -151,181 +184,327 @@ def create_job_description_pdf(output_filename, data, logo_path=None):
             canvas.restoreState()
         except: 
             pass
-    
-    # Add job title (only once)
-    job_title = data.get('job_title', 'Software Developer')
-    content.append(Paragraph(f"<b>{job_title}</b>", styles['JobTitleStyle']))
-    
-    # Add metadata section with all relevant fields (consolidated, no duplicates)
-    metadata_items = [
-        ('team', 'Team'),
-        ('location', 'Location'),
-        ('reporting_to', 'Reporting To'),
-        ('employment_type', 'Employment Type'),
-        ('experience_required', 'Experience Required'),
-        ('salary_range', 'Salary Range'),
-        ('office_timings', 'Office Timings'),
-        ('working_days', 'Working Days'),
-        ('work_schedule', 'Work Schedule')
-    ]
-    
-    for key, label in metadata_items:
-        value = data.get(key, '')
-        if has_content(value):
-            content.append(Paragraph(f"{label}: {value}", styles['JobMetaStyle']))
-    
-    # Add separator
+
+    return _draw_page_elements
+
+def build_job_content(data, styles):
+    return build_document_content(normalize_job_data(data), styles)
+
+class SectionFlowableCache:
+    """Bounded LRU of each section's paragraphs, keyed by style sheet and section content.
+
+    ReportLab marks flowables while laying out a document (``_postponed`` is
+    never cleared), so cached paragraphs are prototypes that never enter a
+    document themselves. Each request gets shallow copies, which share the
+    parsed markup and the line breaks remembered per width but keep their own
+    layout state. An edited section misses and is rebuilt; unchanged ones,
+    including sections repeated across postings, skip parsing and wrapping.
+    """
+
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, build):
+        with self._lock:
+            prototypes = self._entries.get(key)
+            if prototypes is not None:
+                self._entries.move_to_end(key)
+                self.stats['hits'] += 1
+            else:
+                self.stats['misses'] += 1
+        if prototypes is None:
+            prototypes = build()
+            for paragraph in prototypes:
+                # Created up front so every copy shares the one wrap cache
+                paragraph.__dict__.setdefault('_wrap_cache', {})
+            with self._lock:
+                self._entries[key] = prototypes
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.stats['evictions'] += 1
+        return [copy.copy(paragraph) for paragraph in prototypes]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+def build_document_content(document, styles, section_cache=None):
+    def paragraphs(key, build):
+        if section_cache is None:
+            return build()
+        # Style sheets are compiled once per renderer and live as long as it does, so their id identifies them
+        return section_cache.get((id(styles),) + key, build)
+
+    def header():
+        return [CachedParagraph(f"<b>{document.title}</b>", styles['JobTitleStyle'])] + [
+            CachedParagraph(f"{label}: {value}", styles['JobMetaStyle']) for label, value in document.metadata]
+
+    content = paragraphs(('header', document.title, tuple(document.metadata)), header)
     content.extend([Spacer(1, 10), HRFlowable(width="100%", thickness=1, color=colors.grey), Spacer(1, 8)])
-    
-    # Process main content sections
-    sections = [
-        ('company_overview', 'Company Overview'),
-        ('role_overview', 'Role Overview'),
-        ('key_responsibilities', 'Key Responsibilities'),
-        ('technical_requirements', 'Technical Requirements'),
-        ('who_you_are', 'Who You Are'),
-        ('experience_skills', 'Experience & Skills'),
-        ('qualifications', 'Required Qualifications'),
-        ('preferred_qualifications', 'Preferred Qualifications'),
-        ('what_we_offer', 'What We Offer'),
-        ('benefits', 'Benefits & Perks'),
-        ('application_process', 'Application Process')
-    ]
-    
-    for key, title in sections:
-        section_data = data.get(key, '')
-        
-        # Handle special case for benefits fallback
-        if key == 'benefits' and not has_content(section_data):
-            section_data = data.get('compensation_benefits', {})
-        
-        if has_content(section_data):
-            content.append(Paragraph(f"<b>{title}</b>", styles['SectionHeaderStyle']))
-            
-            if isinstance(section_data, list):
-                content.extend(format_bullet_content(section_data, styles))
-            elif isinstance(section_data, dict):
-                if key == 'technical_requirements':
-                    must_have = section_data.get('must_have_skills', [])
-                    nice_to_have = section_data.get('nice_to_have_skills', [])
-                    
-                    if has_content(must_have):
-                        if isinstance(must_have, list):
-                            content.extend(format_bullet_content(must_have, styles))
-                        else:
-                            content.append(Paragraph(str(must_have), styles['BodyTextStyle']))
-                    
-                    if has_content(nice_to_have):
-                        content.append(Paragraph("<b>Nice to have:</b>", styles['BodyTextStyle']))
-                        if isinstance(nice_to_have, list):
-                            content.extend(format_bullet_content(nice_to_have, styles))
-                        else:
-                            content.append(Paragraph(str(nice_to_have), styles['BodyTextStyle']))
-                            
-                elif key in ['qualifications', 'experience_skills']:
-                    items_key = 'mandatory_requirements' if key == 'qualifications' else 'professional_experience'
-                    items = section_data.get(items_key, [])
-                    if has_content(items):
-                        if isinstance(items, list):
-                            content.extend(format_bullet_content(items, styles))
-                        else:
-                            content.append(Paragraph(str(items), styles['BodyTextStyle']))
-                            
-                elif key in ['what_we_offer', 'benefits']:
-                    all_items = []
-                    for k, v in section_data.items():
-                        if has_content(v):
-                            if isinstance(v, list):
-                                all_items.extend(v)
-                            else:
-                                all_items.append(str(v))
-                    
-                    if all_items:
-                        # Limit items to prevent overflow
-                        max_items = 8 if key == 'benefits' else 5
-                        content.extend(format_bullet_content(all_items[:max_items], styles))
-                        
-                elif key == 'application_process':
-                    how_to_apply = section_data.get('how_to_apply', '')
-                    if has_content(how_to_apply):
-                        content.append(Paragraph(str(how_to_apply), styles['BodyTextStyle']))
-                else:
-                    # Handle other dictionary structures
-                    for k, v in section_data.items():
-                        if has_content(v):
-                            content.append(Paragraph(f"<b>{k.replace('_', ' ').title()}:</b>", styles['BodyTextStyle']))
-                            if isinstance(v, list):
-                                content.extend(format_bullet_content(v, styles))
-                            else:
-                                content.append(Paragraph(str(v), styles['BodyTextStyle']))
+
+    for section in document.sections:
+        content.extend(paragraphs(('section', section.title, tuple(section.blocks)), lambda section=section: [
+            CachedParagraph(f"<b>{section.title}</b>", styles['SectionHeaderStyle'])] + block_flowables(section.blocks, styles)))
+        if section.separator:
+            content.extend([Spacer(1, 8), HRFlowable(width="100%", thickness=0.5, color=colors.lightgrey), Spacer(1, 8)])
+    return content
+
+class LayoutEstimate:
+    """Heights from a single layout pass, split into fixed text height and adjustable spacer heights"""
+
+    def __init__(self, fixed_height, spacer_heights):
+        self.fixed_height = fixed_height
+        self.spacer_heights = spacer_heights
+
+    def height(self, *spacing_reductions):
+        """Predict the total height after optimize_content_spacing is applied with each reduction in turn"""
+        total = self.fixed_height
+        for spacer_height in self.spacer_heights:
+            for reduction in spacing_reductions:
+                spacer_height = max(2, spacer_height * (1 - reduction))
+            total += spacer_height
+        return total
+
+def estimate_layout(flowables, available_width):
+    """Wrap each flowable once; spacing changes are then predicted instead of re-wrapped"""
+    fixed_height, spacer_heights = 0, []
+    for flowable in flowables:
+        try:
+            if isinstance(flowable, Spacer):
+                spacer_heights.append(flowable.height)
+            elif hasattr(flowable, 'wrap'):
+                # Spacing optimization only changes Spacer heights; HRFlowable height is its lineWidth
+                _, height = flowable.wrap(available_width, float('inf'))
+                fixed_height += height
+            elif hasattr(flowable, 'height'):
+                fixed_height += flowable.height
             else:
-                content.append(Paragraph(str(section_data), styles['BodyTextStyle']))
-            
-            # Add section separator (except for last section)
-            if key != sections[-1][0] or sections.index((key, title)) < len(sections) - 1:
-                content.extend([Spacer(1, 8), HRFlowable(width="100%", thickness=0.5, color=colors.lightgrey), Spacer(1, 8)])
-    
-    def measure_content_height(flowables, available_width):
-        """More accurate content height measurement"""
-        total_height = 0
-        for flowable in flowables:
+                # Default fallback for unknown flowables
+                fixed_height += 12
+        except Exception:
+            # Fallback height if wrap fails
+            fixed_height += 12
+    return LayoutEstimate(fixed_height, spacer_heights)
+
+def optimize_content_spacing(content_list, target_reduction=0.15):
+    """Optimize spacing to fit content better"""
+    for flowable in content_list:
+        if isinstance(flowable, Spacer) and hasattr(flowable, 'height'):
             try:
-                if hasattr(flowable, 'wrap'):
-                    _, height = flowable.wrap(available_width, float('inf'))
-                    total_height += height
-                elif hasattr(flowable, 'height'):
-                    total_height += flowable.height
-                else:
-                    # Default fallback for unknown flowables
-                    total_height += 12
-            except Exception:
-                # Fallback height if wrap fails
-                total_height += 12
-        return total_height
-
-    def optimize_content_spacing(content_list, target_reduction=0.15):
-        """Optimize spacing to fit content better"""
-        for flowable in content_list:
-            if isinstance(flowable, Spacer) and hasattr(flowable, 'height'):
-                try:
-                    flowable.height = max(2, flowable.height * (1 - target_reduction))
-                except:
-                    pass
-            elif isinstance(flowable, HRFlowable):
-                try:
-                    flowable.thickness = max(0.5, getattr(flowable, 'thickness', 1) * 0.8)
-                except:
-                    pass
+                flowable.height = max(2, flowable.height * (1 - target_reduction))
+            except:
+                pass
+        elif isinstance(flowable, HRFlowable):
+            try:
+                flowable.thickness = max(0.5, getattr(flowable, 'thickness', 1) * 0.8)
+            except:
+                pass
 
-    def adjust_font_sizes(styles_dict, reduction=1):
-        """Reduce font sizes to fit more content"""
-        style_names = ['BodyTextStyle', 'BulletContentStyle', 'BulletTitleStyle', 'JobMetaStyle']
-        for name in style_names:
-            if name in styles_dict:
-                style = styles_dict[name]
-                style.fontSize = max(8, style.fontSize - reduction)
-                style.leading = max(style.fontSize + 1, style.leading - reduction)
-        
-        if 'SectionHeaderStyle' in styles_dict:
-            header_style = styles_dict['SectionHeaderStyle']
-            header_style.fontSize = max(10, header_style.fontSize - reduction)
-            header_style.leading = max(header_style.fontSize + 1, header_style.leading - reduction)
-
-    # Check if content fits and optimize if needed
-    available_height = doc.height * 2.8  # Allow for reasonable multi-page content
-    content_height = measure_content_height(content, doc.width)
-    
-    if content_height > available_height:
-        # First optimization: reduce spacing
-        optimize_content_spacing(content, 0.2)
-        
-        # Re-measure after spacing optimization
-        content_height = measure_content_height(content, doc.width)
-        
-        if content_height > available_height * 1.1:
-            # Second optimization: reduce font sizes slightly
-            adjust_font_sizes(styles, 1)
-            optimize_content_spacing(content, 0.3)
-    
-    # Build the PDF
-    doc.build(content, onFirstPage=_draw_page_elements, onLaterPages=_draw_page_elements)
\ No newline at end of file
+class JobDescriptionRenderer:
+    """Renders job descriptions from style sheets compiled once and shared by every document.
+
+    The regular and compact (reduced font) sheets are both built up front and
+    never mutated afterwards, so one renderer can serve many documents and
+    threads without per-document style construction. Every render method
+    takes either job_data or a JobDocument that has already been normalized.
+    Paragraphs are reused per section through ``section_cache``, so
+    re-rendering an edited posting only rebuilds the sections that changed;
+    ``use_section_cache=False`` builds every paragraph afresh, as benchmarks
+    of first renders need.
+
+    With ``reproducible`` set, ReportLab's invariant mode replaces the
+    creation timestamp and document ID with fixed values, so identical
+    input, logo and TEMPLATE_VERSION give identical bytes. An ``output_store``
+    implies that mode: renders are looked up by render_key first and only
+    rendered, then stored, on a miss.
+    """
+
+    def __init__(self, pagesize=letter, top_margin=1.4*inch, bottom_margin=1.2*inch, left_margin=1*inch, right_margin=1*inch, logo_cache=None, section_cache=None, use_section_cache=True, reproducible=False, output_store=None):
+        self.pagesize = pagesize
+        self.reproducible = reproducible
+        self.output_store = output_store
+        self.logo_cache = logo_cache or get_logo_cache()
+        if not use_section_cache:
+            self.section_cache = None
+        else:
+            self.section_cache = section_cache if section_cache is not None else SectionFlowableCache()
+        self.margins = {'topMargin': top_margin, 'bottomMargin': bottom_margin, 'leftMargin': left_margin, 'rightMargin': right_margin}
+        self.styles = setup_pdf_styles()
+        self.compact_styles = derive_compact_styles(self.styles, 1)
+
+    def render_key(self, data, logo_path=None):
+        """Hash of everything a reproducible render depends on: document, logo bytes, page geometry and template.
+
+        job_data is normalized first, so the same posting passed as job_data
+        or as a JobDocument shares a key and fields that are never rendered
+        do not change it.
+        """
+        document = data if isinstance(data, JobDocument) else normalize_job_data(data)
+        logo_digest = self.logo_cache.digest(logo_path) if logo_path else None
+        payload = json.dumps([TEMPLATE_VERSION, REPORTLAB_VERSION, list(self.pagesize), self.margins, logo_digest, document],
+                             sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def render(self, output_filename, data, logo_path=None, output_store=None):
+        """Render to a path or binary stream; with an output store, returns the stored artifact's path"""
+        output_store = output_store or self.output_store
+        with instrumentation.timer('pdf.render'):
+            if output_store is None:
+                self._render(output_filename, data, logo_path, self.reproducible)
+                return None
+            return self._render_stored(output_store, output_filename, data, logo_path)
+
+    def _render_stored(self, output_store, output_filename, data, logo_path=None):
+        if not isinstance(data, JobDocument):
+            with instrumentation.timer('document.normalize'):
+                data = normalize_job_data(data)
+        key = self.render_key(data, logo_path)
+        path = output_store.get(key)
+        if path is None:
+            instrumentation.count('pdf.store_misses')
+            buffer = io.BytesIO()
+            self._render(buffer, data, logo_path, invariant=True)
+            path = output_store.put(key, buffer.getbuffer())
+        else:
+            instrumentation.count('pdf.store_hits')
+        output_store.export(path, output_filename)
+        return path
+
+    def _render(self, output_filename, data, logo_path=None, invariant=False):
+        if isinstance(output_filename, (str, os.PathLike)):
+            _detach_hard_link(output_filename)
+        # None leaves ReportLab's global rl_config.invariant in charge
+        doc = SimpleDocTemplate(output_filename, pagesize=self.pagesize, invariant=1 if invariant else None, **self.margins)
+        if isinstance(data, JobDocument):
+            document = data
+        else:
+            with instrumentation.timer('document.normalize'):
+                document = normalize_job_data(data)
+        with instrumentation.timer('pdf.build_flowables', styles='regular'):
+            content = build_document_content(document, self.styles, self.section_cache)
+
+        # Check if content fits and optimize if needed. Measuring at the frame's inner width lets
+        # doc.build reuse these line breaks instead of laying every paragraph out again.
+        available_height = doc.height * 2.8  # Allow for reasonable multi-page content
+        with instrumentation.timer('pdf.fit_measure'):
+            layout = estimate_layout(content, doc.width - 2 * FRAME_PADDING)
+
+        if layout.height() > available_height:
+            if layout.height(0.2) > available_height * 1.1:
+                # Spacing alone won't do: rebuild with the compact fonts and tighter spacing
+                with instrumentation.timer('pdf.build_flowables', styles='compact'):
+                    content = build_document_content(document, self.compact_styles, self.section_cache)
+                with instrumentation.timer('pdf.optimize_pass', reduction='0.2'):
+                    optimize_content_spacing(content, 0.2)
+                with instrumentation.timer('pdf.optimize_pass', reduction='0.3'):
+                    optimize_content_spacing(content, 0.3)
+            else:
+                # Reducing spacing is enough
+                with instrumentation.timer('pdf.optimize_pass', reduction='0.2'):
+                    optimize_content_spacing(content, 0.2)
+
+        # Build the PDF
+        draw_page_elements = make_page_decorator(document, logo_path, self.logo_cache)
+        recording = instrumentation.get_recorder() is not None
+        start_offset = _stream_offset(output_filename) if recording else None
+        with instrumentation.timer('pdf.doc_build'):
+            doc.build(content, onFirstPage=draw_page_elements, onLaterPages=draw_page_elements)
+        if recording:
+            instrumentation.count('pdf.documents')
+            instrumentation.count('pdf.pages', doc.page)
+            written = _bytes_written(output_filename, start_offset)
+            if written is not None:
+                instrumentation.count('pdf.bytes', written)
+
+    def render_bytes(self, data, logo_path=None, as_memoryview=False):
+        """Render into memory and return the PDF as bytes, or a memoryview over the buffer"""
+        buffer = io.BytesIO()
+        self.render(buffer, data, logo_path)
+        return buffer.getbuffer() if as_memoryview else buffer.getvalue()
+
+    def iter_chunks(self, data, logo_path=None, chunk_size=64 * 1024):
+        """Yield the PDF in chunks; nothing is rendered until iteration starts and the buffer is dropped afterwards"""
+        buffer = io.BytesIO()
+        self.render(buffer, data, logo_path)
+        buffer.seek(0)
+        try:
+            while True:
+                chunk = buffer.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            buffer.close()
+
+def _detach_hard_link(path):
+    """Unlink a path that is hard-linked elsewhere (e.g. exported from an OutputStore) instead of writing through it"""
+    try:
+        if os.stat(path).st_nlink > 1:
+            os.remove(path)
+    except OSError:
+        pass
+
+def _stream_offset(output):
+    """Current position of a seekable stream, 0 for a path, or None for pipes and sockets"""
+    if not hasattr(output, 'tell'):
+        return 0
+    try:
+        return output.tell()
+    except (OSError, io.UnsupportedOperation):
+        return None
+
+def _bytes_written(output, start_offset):
+    """Bytes the render added, or None when the output cannot report them"""
+    if start_offset is None:
+        return None
+    if hasattr(output, 'tell'):
+        end_offset = _stream_offset(output)
+        return None if end_offset is None else end_offset - start_offset
+    try:
+        return os.path.getsize(output)
+    except OSError:
+        return None
+
+_default_renderer = None
+_default_renderer_lock = threading.Lock()
+
+def get_renderer():
+    """Return the shared JobDescriptionRenderer, compiling its styles on first use"""
+    global _default_renderer
+    if _default_renderer is None:
+        with _default_renderer_lock:
+            if _default_renderer is None:
+                _default_renderer = JobDescriptionRenderer()
+    return _default_renderer
+
+def get_output_settings():
+    """(reproducible, output store root) of the shared renderer, picklable for worker processes"""
+    renderer = get_renderer()
+    return renderer.reproducible, renderer.output_store.root if renderer.output_store else None
+
+def apply_output_settings(reproducible=False, output_store_root=None):
+    """Configure the shared renderer, in this process or a worker given get_output_settings()"""
+    from utils.output_store import OutputStore
+    renderer = get_renderer()
+    renderer.reproducible = reproducible
+    renderer.output_store = OutputStore(output_store_root) if output_store_root else None
+
+def create_job_description_pdf(output_filename, data, logo_path=None, output_store=None):
+    """Render to a filesystem path or to any writable binary stream.
+
+    With an output store (passed here or set with apply_output_settings) a
+    posting rendered before is hard-linked or copied from the store instead
+    of being rendered, and the stored artifact's path is returned.
+    """
+    return get_renderer().render(output_filename, data, logo_path, output_store)
+
+def create_job_description_pdf_bytes(data, logo_path=None, as_memoryview=False):
+    return get_renderer().render_bytes(data, logo_path, as_memoryview)
+
+def stream_job_description_pdf(data, logo_path=None, chunk_size=64 * 1024):
+    """Generator of PDF chunks suitable for a streaming HTTP response body"""
+    return get_renderer().iter_chunks(data, logo_path, chunk_size)
@@ -0,0 +1,141 @@
+import json
+import re
+
+# Bump whenever the instructions below change so cached responses are not reused across templates
+PROMPT_TEMPLATE_VERSION = 3
+
+STATIC_INSTRUCTIONS = """You are an HR specialist who writes accurate, clear job descriptions for every industry.
+Rules:
+- Use ONLY facts from the user prompt. Never invent company details, contact details, websites or placeholders; leave unknown fields as "".
+- Return ONLY one flat JSON object with the keys below, in this order. No markdown, no extra text, never echo these instructions.
+- List items are strings formatted "Title: description"; word counts are per item.
+
+Keys:
+company_name: from prompt, else ""
+job_title: from prompt, else inferred from the role or skills mentioned
+job_code, location, department, team, reporting_to, employment_type: from prompt, else ""
+experience_required: exact level from prompt (Fresher, Entry Level, Mid Level, Senior Level, Trainee), else ""
+office_timings, working_days: hours/shifts and work week from prompt, else ""
+industry_type: one of IT/Technology, Healthcare/Medical, Manufacturing, Finance/Banking, Education, Retail, Construction, Government, Non-Profit, Other
+company_overview: tailored overview if company_name is known, else a generic 50-word overview for the industry; no unverifiable claims
+role_overview: 100-120 words on the role's responsibilities and industry context
+salary_range: exactly as written in the prompt without currency symbols ("3.5 LPA" stays "3.5 LPA"), else ""
+key_responsibilities: 6 items, 30-50 words: Primary Role Focus; <industry-specific duties>; Quality & Standards Compliance; <process/project management>; Documentation & Reporting; Team Collaboration
+technical_requirements: 4 items: three core skills from the prompt with proficiency, tools or techniques; one supporting skill, license or certification
+who_you_are: 4 items, 30-50 words: Professional Excellence; Industry Expertise; Communication Skills; Problem-Solving Mindset
+experience_skills: 3 items: Professional Experience (50-70 words); Industry Expertise (30-50); Functional Knowledge (30-40)
+qualifications: 3 items, 30-50 words: Educational Background; Professional Experience; <industry-specific licenses or certifications>
+preferred_qualifications: 3 items, 30-50 words: Advanced <industry> Skills; Professional Certifications; Leadership Experience
+what_we_offer: 5 items, 40-50 words: Career Growth Opportunities; <industry-appropriate> Work Environment; Competitive Compensation; Work-Life Balance; Professional Development
+benefits: 5 items, 30-55 words: Health & Wellness Coverage; Learning & Development Support; <work arrangement benefits>; <industry-specific allowances>; Team Culture & Engagement
+application_process: steps suited to the role level (review, screening, assessment/interviews, reference checks, decision), 2-4 week timeline, no contact details
+company_website: only if the prompt contains a URL, else \"\""""
+
+INDUSTRY_FOCUS = {
+    'IT/Technology': "technical skills, coding, software, frameworks",
+    'Healthcare/Medical': "patient care, medical procedures, certifications, compliance",
+    'Manufacturing': "production processes, safety, quality control, equipment operation",
+    'Finance/Banking': "financial analysis, regulations, risk management, client services",
+    'Education': "teaching methods, curriculum, student development, educational technology",
+    'Retail': "customer service, sales, inventory, merchandising",
+    'Construction': "safety protocols, technical skills, project management, regulations",
+    'Non-Profit': "mission alignment, community impact, fundraising, program management",
+}
+
+INDUSTRY_KEYWORDS = {
+    'IT/Technology': ['software', 'developer', 'engineer', 'python', 'java', 'devops', 'data scientist', 'frontend',
+                      'backend', 'full stack', 'cloud', 'it support', 'programmer', 'machine learning', 'web'],
+    'Healthcare/Medical': ['nurse', 'doctor', 'hospital', 'clinic', 'medical', 'patient', 'pharmacist', 'healthcare',
+                           'physician', 'therapist'],
+    'Manufacturing': ['plant', 'production', 'factory', 'assembly', 'machinist', 'cnc', 'fabrication'],
+    'Finance/Banking': ['bank', 'finance', 'financial', 'accountant', 'accounting', 'audit', 'loan', 'credit',
+                        'investment', 'insurance'],
+    'Education': ['teacher', 'school', 'tutor', 'lecturer', 'professor', 'education', 'curriculum', 'principal'],
+    'Retail': ['retail', 'store', 'cashier', 'sales associate', 'shop'],
+    'Construction': ['construction', 'site engineer', 'civil', 'contractor', 'electrician', 'plumber', 'foreman'],
+    'Non-Profit': ['ngo', 'non-profit', 'nonprofit', 'charity', 'fundraising', 'volunteer'],
+}
+
+# Stems match any word they start, e.g. 'pharmac' for pharmacy and pharmaceutical
+INDUSTRY_STEMS = {
+    'Healthcare/Medical': ['pharmac'],
+    'Manufacturing': ['manufactur'],
+    'Retail': ['merchandis'],
+}
+
+def _industry_pattern(industry):
+    # Keywords must be whole words (plurals allowed), so 'web' does not match "website"
+    words = '|'.join(re.escape(keyword) for keyword in INDUSTRY_KEYWORDS.get(industry, []))
+    stems = '|'.join(re.escape(stem) for stem in INDUSTRY_STEMS.get(industry, []))
+    return re.compile(r'\b(?:(' + words + r')(?:e?s)?\b|(' + stems + '))' if stems else r'\b(' + words + r')(?:e?s)?\b')
+
+_INDUSTRY_PATTERNS = {industry: _industry_pattern(industry) for industry in INDUSTRY_KEYWORDS}
+
+GENERIC_FOCUS = "Adapt duties, skills and benefits to the industry the role belongs to."
+
+# Fields sent as context when only some sections of an existing job description are regenerated
+EDIT_CONTEXT_FIELDS = ['job_title', 'company_name', 'industry_type', 'experience_required', 'location', 'employment_type']
+
+def estimate_tokens(text):
+    """Rough token count (about four characters per token) for prompts the API has not counted"""
+    return max(1, len(text) // 4)
+
+def detect_industry(prompt):
+    """Return the INDUSTRY_FOCUS key whose keywords best match the prompt, or None"""
+    text = prompt.lower()
+    best, best_hits = None, 0
+    for industry, pattern in _INDUSTRY_PATTERNS.items():
+        hits = len(set(pattern.findall(text)))
+        if hits > best_hits:
+            best, best_hits = industry, hits
+    return best
+
+class PromptBuilder:
+    """Builds Gemini prompts from instructions compiled once per process.
+
+    The static instructions form a fixed prefix that can be sent as the
+    model's system instruction, where it is eligible for the API's prefix
+    caching. Each request then only carries the user prompt and the one
+    industry adaptation that applies to it.
+    """
+
+    version = PROMPT_TEMPLATE_VERSION
+
+    def __init__(self, instructions=STATIC_INSTRUCTIONS):
+        self.system_instruction = instructions
+        self.system_tokens = estimate_tokens(instructions)
+        self._focus_lines = {industry: f"Industry focus ({industry}): {focus}." for industry, focus in INDUSTRY_FOCUS.items()}
+
+    def user_content(self, prompt, industry=None):
+        industry = industry or detect_industry(prompt)
+        focus = self._focus_lines.get(industry, GENERIC_FOCUS)
+        return f'User prompt: "{prompt}"\n{focus}'
+
+    def build(self, prompt, industry=None):
+        """Return (system_instruction, user_content) for models configured with a system instruction"""
+        return self.system_instruction, self.user_content(prompt, industry)
+
+    def build_single(self, prompt, industry=None):
+        """Return the whole prompt as one string for models without a system instruction"""
+        return self.system_instruction + "\n\n" + self.user_content(prompt, industry)
+
+    def build_update(self, job_data, keys, instruction=''):
+        """Ask for new values of ``keys`` only, given their current values and a few context fields"""
+        context = {key: job_data[key] for key in EDIT_CONTEXT_FIELDS if key not in keys and job_data.get(key)}
+        current = {key: job_data.get(key, '') for key in keys}
+        industry = job_data.get('industry_type')
+        if industry not in INDUSTRY_FOCUS:
+            industry = detect_industry(f"{job_data.get('job_title', '')} {instruction}")
+        lines = [f"Existing job description: {json.dumps(context, ensure_ascii=False)}",
+                 f"Current values: {json.dumps(current, ensure_ascii=False)}"]
+        if instruction:
+            lines.append(f'Requested change: "{instruction}"')
+        lines.append(self._focus_lines.get(industry, GENERIC_FOCUS))
+        lines.append(f"Rewrite only these keys following the rules and return ONLY a JSON object containing them: {', '.join(keys)}")
+        return '\n'.join(lines)
+
+    def build_retry(self, prompt, keys):
+        return (self.user_content(prompt) + "\nYour previous answer could not be parsed. Return ONLY a JSON object "
+                f"containing these keys: {', '.join(keys)}")
+
+default_prompt_builder = PromptBuilder()
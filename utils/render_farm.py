@@ -0,0 +1,249 @@
+import io
+import itertools
+import multiprocessing
+import os
+import queue
+import threading
+import time
+
+MAX_RESTART_DELAY = 5.0
+
+def _worker_main(job_queue, result_queue, preload_logo_path, output_settings=None):
+    """Render jobs until a None sentinel arrives, reporting each one back to the parent"""
+    from utils.pdf_generator import apply_output_settings, get_renderer
+
+    renderer = get_renderer()
+    # Warm up fonts, image decoding and the style sheets before taking real work
+    try:
+        renderer.render(io.BytesIO(), {'job_title': 'Warm-up'}, preload_logo_path)
+    except Exception:
+        pass
+    # Applied after the warm-up so it never lands in the output store
+    if output_settings:
+        apply_output_settings(*output_settings)
+
+    pid = os.getpid()
+    while True:
+        job = job_queue.get()
+        if job is None:
+            break
+        seq, job_id, output_path, job_data, logo_path, submitted_at = job
+        started_at = time.time()
+        result = {'id': job_id, 'output': output_path, 'worker': pid,
+                  'queue_seconds': round(started_at - submitted_at, 3)}
+        start = time.perf_counter()
+        try:
+            renderer.render(output_path, job_data, logo_path)
+            result['status'] = 'ok'
+        except Exception as e:
+            result.update(status='error', error=str(e))
+        result['render_seconds'] = round(time.perf_counter() - start, 3)
+        result_queue.put((seq, result))
+
+class RenderFarm:
+    """Pool of rendering processes fed from a bounded job queue.
+
+    Each worker builds the shared renderer once and warms it up with the
+    preload logo, then renders ``(output_path, job_data, logo_path)`` jobs.
+    ``submit`` blocks (or raises ``queue.Full``) once ``queue_size`` jobs are
+    waiting. A dispatcher thread hands each job to one idle worker through
+    that worker's own queue and records the assignment first, so the job a
+    dying worker held is always known and reported as failed. A supervisor
+    thread restarts dead workers after a doubling delay; a worker that dies
+    ``max_restarts`` times in a row without finishing a job is retired, and
+    once every worker is retired all outstanding jobs fail and ``submit``
+    raises. Results are delivered to ``on_result`` when given, otherwise
+    they can be read from ``results()``. ``output_settings`` (from
+    get_output_settings) gives workers the parent's reproducible mode and
+    output store.
+    """
+
+    def __init__(self, workers=None, queue_size=None, preload_logo_path=None, on_result=None, mp_context='spawn', output_settings=None,
+                 max_restarts=5, restart_delay=0.1):
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.preload_logo_path = preload_logo_path
+        self.output_settings = output_settings
+        self.on_result = on_result
+        self.max_restarts = max_restarts
+        self.restart_delay = restart_delay
+        self.restarts = 0
+        self._ctx = multiprocessing.get_context(mp_context)
+        self._pending = queue.Queue(maxsize=queue_size or self.workers * 4)
+        self._result_queue = self._ctx.Queue()
+        self._results = queue.Queue()
+        self._seq = itertools.count(1)
+        self._outstanding = {}
+        self._pending_lock = threading.Condition()
+        # Per worker: its process and job queue, the seq it was handed (0 when idle), deaths in a row and restart time
+        self._processes, self._job_queues = [], []
+        self._assigned = [0] * self.workers
+        self._crashes = [0] * self.workers
+        self._restart_at = [None] * self.workers
+        self._retired = [False] * self.workers
+        self._failure = None
+        self._closing = False
+        for _ in range(self.workers):
+            process, job_queue = self._start_worker()
+            self._processes.append(process)
+            self._job_queues.append(job_queue)
+        self._dispatcher = threading.Thread(target=self._dispatch, name='render-farm-dispatcher', daemon=True)
+        self._dispatcher.start()
+        self._supervisor = threading.Thread(target=self._supervise, name='render-farm-supervisor', daemon=True)
+        self._supervisor.start()
+
+    def _start_worker(self):
+        # A fresh queue per process, so a job handed to a dead worker is never picked up by its replacement
+        job_queue = self._ctx.Queue()
+        process = self._ctx.Process(target=_worker_main, args=(job_queue, self._result_queue, self.preload_logo_path, self.output_settings), daemon=True)
+        process.start()
+        return process, job_queue
+
+    def submit(self, output_path, job_data, logo_path=None, job_id=None, block=True, timeout=None):
+        """Queue a render job; applies backpressure when the queue is full"""
+        if self._closing:
+            raise RuntimeError("RenderFarm is closed")
+        if self._failure:
+            raise RuntimeError(self._failure)
+        seq = next(self._seq)
+        job_id = job_id if job_id is not None else seq
+        with self._pending_lock:
+            self._outstanding[seq] = (job_id, output_path)
+        try:
+            self._pending.put((seq, job_id, output_path, job_data, logo_path, time.time()), block, timeout)
+        except Exception:
+            with self._pending_lock:
+                self._outstanding.pop(seq, None)
+            raise
+        return job_id
+
+    def _failed(self, seq, error, worker=None):
+        with self._pending_lock:
+            job_id, output_path = self._outstanding.get(seq, (seq, None))
+        self._deliver(seq, {'id': job_id, 'output': output_path, 'worker': worker, 'status': 'error', 'error': error})
+
+    def _deliver(self, seq, result):
+        with self._pending_lock:
+            if self._outstanding.pop(seq, None) is None:
+                return
+        if self.on_result:
+            try:
+                self.on_result(result)
+            except Exception:
+                pass
+        else:
+            self._results.put(result)
+        with self._pending_lock:
+            self._pending_lock.notify_all()
+
+    def _dispatch(self):
+        while (job := self._pending.get()) is not None:
+            with self._pending_lock:
+                while not self._failure:
+                    index = next((i for i, seq in enumerate(self._assigned)
+                                  if not seq and self._restart_at[i] is None and not self._retired[i]
+                                  and self._processes[i].is_alive()), None)
+                    if index is not None:
+                        self._assigned[index] = job[0]
+                        self._job_queues[index].put(job)
+                        break
+                    self._pending_lock.wait(0.2)
+                failure = self._failure
+            if failure:
+                self._failed(job[0], failure)
+
+    def _supervise(self):
+        while True:
+            try:
+                seq, result = self._result_queue.get(timeout=0.2)
+            except queue.Empty:
+                if self._closing and not any(p.is_alive() for p in self._processes):
+                    break
+            else:
+                with self._pending_lock:
+                    for index, assigned in enumerate(self._assigned):
+                        if assigned == seq:
+                            self._assigned[index] = 0
+                            self._crashes[index] = 0
+                self._deliver(seq, result)
+            # Checked after every result too, so a busy farm still notices a dead worker promptly
+            for index, process in enumerate(self._processes):
+                if process.is_alive() or self._closing or self._retired[index]:
+                    continue
+                if self._restart_at[index] is None:
+                    self._worker_died(index, process)
+                elif time.monotonic() >= self._restart_at[index]:
+                    process, job_queue = self._start_worker()
+                    with self._pending_lock:
+                        self._processes[index], self._job_queues[index] = process, job_queue
+                        self._restart_at[index] = None
+                        self.restarts += 1
+                        self._pending_lock.notify_all()
+
+    def _worker_died(self, index, process):
+        """Fail the job a dead worker held, then schedule its restart or retire it"""
+        with self._pending_lock:
+            seq, self._assigned[index] = self._assigned[index], 0
+            self._crashes[index] += 1
+            crashes = self._crashes[index]
+            if crashes > self.max_restarts:
+                self._retired[index] = True
+            else:
+                self._restart_at[index] = time.monotonic() + min(self.restart_delay * 2 ** (crashes - 1), MAX_RESTART_DELAY)
+            all_retired = all(self._retired)
+        if seq:
+            self._failed(seq, f"Render worker exited with code {process.exitcode}", process.pid)
+        if all_retired:
+            self._fail_all(f"Render workers keep exiting (last exit code {process.exitcode}); "
+                           f"each was restarted {self.max_restarts} times without finishing a job")
+
+    def _fail_all(self, error):
+        """Stop taking work and fail every job still waiting or in flight"""
+        with self._pending_lock:
+            self._failure = error
+            self._pending_lock.notify_all()
+        # Drained so blocked submits return; the dispatcher fails anything that slips in afterwards
+        while True:
+            try:
+                self._pending.get_nowait()
+            except queue.Empty:
+                break
+        with self._pending_lock:
+            seqs = list(self._outstanding)
+        for seq in seqs:
+            self._failed(seq, error)
+
+    def results(self, timeout=None):
+        """Yield results as they finish until every submitted job has been reported"""
+        while True:
+            with self._pending_lock:
+                if not self._outstanding and self._results.empty():
+                    return
+            try:
+                yield self._results.get(timeout=timeout if timeout is not None else 0.2)
+            except queue.Empty:
+                if timeout is not None:
+                    return
+
+    def join(self):
+        """Wait until every submitted job has produced a result"""
+        with self._pending_lock:
+            while self._outstanding:
+                self._pending_lock.wait(0.2)
+
+    def close(self):
+        self.join()
+        self._closing = True
+        self._pending.put(None)
+        self._dispatcher.join()
+        for process, job_queue in zip(self._processes, self._job_queues):
+            if process.is_alive():
+                job_queue.put(None)
+        for process in self._processes:
+            process.join()
+        self._supervisor.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
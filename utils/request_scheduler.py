@@ -0,0 +1,258 @@
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from utils import instrumentation
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+# Statuses that mean this model cannot serve the request, so the next model should be tried
+FAILOVER_STATUS = {404}
+
+def error_status(error):
+    """HTTP-style status of an API error; google.api_core exceptions carry it as ``code``"""
+    for attribute in ('code', 'status_code', 'status'):
+        value = getattr(error, attribute, None)
+        if callable(value):
+            try:
+                value = value()
+            except Exception:
+                value = None
+        value = getattr(value, 'value', value)
+        # gRPC status codes come through as (number, name) tuples
+        if isinstance(value, tuple) and value:
+            value = {8: 429, 14: 503, 13: 500, 4: 504, 5: 404}.get(value[0])
+        if isinstance(value, int):
+            return value
+    return None
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at ``rate_per_minute``.
+
+    At most ``capacity`` tokens accumulate, which bounds bursts. A request
+    larger than the capacity is let through once the bucket is full and
+    leaves it in debt, so later requests wait until the rate catches up.
+    """
+
+    def __init__(self, rate_per_minute, capacity=None, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or rate_per_minute
+        self._tokens = float(self.capacity)
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, amount=1):
+        with self._lock:
+            self._refill()
+            if self._tokens >= min(amount, self.capacity):
+                self._tokens -= amount
+                return True
+            return False
+
+    def acquire(self, amount=1):
+        """Block until ``amount`` tokens are available; returns the seconds spent waiting"""
+        needed = min(amount, self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= needed:
+                    self._tokens -= amount
+                    return waited
+                delay = (needed - self._tokens) / self.rate
+            self._sleep(delay)
+            waited += delay
+
+class _SlotStream:
+    """Iterator over a streamed response that keeps its model slot until it is exhausted, fails or is closed"""
+
+    def __init__(self, chunks, release):
+        self._chunks = iter(chunks)
+        self._release = release
+        self._lock = threading.Lock()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._release is None:
+            raise StopIteration
+        try:
+            return next(self._chunks)
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self):
+        with self._lock:
+            release, self._release = self._release, None
+        if release is not None:
+            release()
+            close = getattr(self._chunks, 'close', None)
+            if close is not None:
+                close()
+
+    def __del__(self):
+        # An abandoned stream must not keep its slot forever
+        self.close()
+
+def _close_stream(future):
+    """Done-callback that frees the slot of a hedged stream that lost the race"""
+    if not future.cancelled() and future.exception() is None and isinstance(future.result(), _SlotStream):
+        future.result().close()
+
+class RequestScheduler:
+    """Paces, retries, hedges and fails over model requests.
+
+    ``call(request_fn, tokens)`` runs ``request_fn(model_name)`` once the
+    requests-per-minute and tokens-per-minute buckets allow it and a slot
+    under the model's concurrency cap is free. With ``stream=True`` the
+    result is iterated through a wrapper that keeps the slot until the
+    stream is consumed or closed, so the cap covers the whole response. 429 and 5xx errors are
+    retried with full-jitter exponential backoff; when a model keeps failing
+    or reports it cannot serve the request, the next name in ``model_names``
+    takes over. Both buckets hold ``burst_seconds`` worth of quota, so calls
+    are spread across the minute instead of spending it in one burst.
+
+    With ``hedge_after`` set, a request that has been running that many
+    seconds gets one duplicate and the first answer wins. Hedges only fire
+    when the model has a free slot and the rate buckets have room, so they
+    never queue behind other requests or push past the quota.
+    """
+
+    def __init__(self, model_names, requests_per_minute=None, tokens_per_minute=None, max_concurrency_per_model=4,
+                 max_attempts=5, base_delay=1.0, max_delay=32.0, hedge_after=None, burst_seconds=5,
+                 clock=time.monotonic, sleep=time.sleep):
+        self.model_names = list(model_names)
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.hedge_after = hedge_after
+        self.stats = {'requests': 0, 'attempts': 0, 'retries': 0, 'failovers': 0, 'hedges': 0, 'hedge_wins': 0,
+                      'throttled_seconds': 0.0, 'errors': {}}
+        self._sleep = sleep
+        self._random = random.Random()
+        self._request_bucket = self._token_bucket = None
+        if requests_per_minute:
+            self._request_bucket = TokenBucket(requests_per_minute, max(1, requests_per_minute * burst_seconds / 60),
+                                               clock=clock, sleep=sleep)
+        if tokens_per_minute:
+            self._token_bucket = TokenBucket(tokens_per_minute, max(1, tokens_per_minute * burst_seconds / 60),
+                                             clock=clock, sleep=sleep)
+        self._model_slots = {name: threading.BoundedSemaphore(max_concurrency_per_model) for name in self.model_names}
+        self._stats_lock = threading.Lock()
+        self._hedge_pool = None
+        if hedge_after:
+            # Room for every slot's request plus its hedge, so hedged calls never queue for a thread
+            self._hedge_pool = ThreadPoolExecutor(max_workers=2 * max_concurrency_per_model * len(self.model_names),
+                                                  thread_name_prefix='gemini-hedge')
+
+    def _count(self, key, amount=1):
+        with self._stats_lock:
+            self.stats[key] += amount
+
+    def _pace(self, tokens):
+        waited = 0.0
+        if self._request_bucket:
+            waited += self._request_bucket.acquire(1)
+        if self._token_bucket and tokens:
+            waited += self._token_bucket.acquire(tokens)
+        if waited:
+            self._count('throttled_seconds', waited)
+            instrumentation.observe('gemini.throttled', waited)
+
+    def _has_quota(self, tokens):
+        if self._request_bucket and not self._request_bucket.try_acquire(1):
+            return False
+        if self._token_bucket and tokens and not self._token_bucket.try_acquire(tokens):
+            return False
+        return True
+
+    def _run(self, request_fn, model_name, started=None, stream=False):
+        self._model_slots[model_name].acquire()
+        if started is not None:
+            started.set()
+        return self._run_in_slot(request_fn, model_name, stream)
+
+    def _run_in_slot(self, request_fn, model_name, stream=False):
+        """Run in a slot the caller already holds; a stream takes the slot with it"""
+        release = self._model_slots[model_name].release
+        try:
+            self._count('attempts')
+            result = request_fn(model_name)
+        except BaseException:
+            release()
+            raise
+        if stream:
+            return _SlotStream(result, release)
+        release()
+        return result
+
+    def _run_hedged(self, request_fn, model_name, tokens, stream=False):
+        started = threading.Event()
+        first = self._hedge_pool.submit(self._run, request_fn, model_name, started, stream)
+        # The hedge delay counts from when the request holds a slot, not from when it was queued
+        started.wait()
+        done, _ = wait([first], timeout=self.hedge_after)
+        if done or not self._model_slots[model_name].acquire(blocking=False):
+            return first.result()
+        if not self._has_quota(tokens):
+            self._model_slots[model_name].release()
+            return first.result()
+        self._count('hedges')
+        instrumentation.count('gemini.hedges')
+        hedge = self._hedge_pool.submit(self._run_in_slot, request_fn, model_name, stream)
+        pending, error = {first, hedge}, None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            winner = next((future for future in done if future.exception() is None), None)
+            if winner is not None:
+                for loser in (done | pending) - {winner}:
+                    loser.add_done_callback(_close_stream)
+                if winner is hedge:
+                    self._count('hedge_wins')
+                return winner.result()
+            error = next(iter(done)).exception()
+        raise error
+
+    def backoff_delay(self, attempt):
+        """Full-jitter exponential backoff for the given zero-based retry number"""
+        return self._random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def call(self, request_fn, tokens=0, stream=False):
+        self._count('requests')
+        last_error = None
+        for index, model_name in enumerate(self.model_names):
+            if index:
+                self._count('failovers')
+                instrumentation.count('gemini.failovers', model=model_name)
+            for attempt in range(self.max_attempts):
+                self._pace(tokens)
+                try:
+                    if self._hedge_pool:
+                        return self._run_hedged(request_fn, model_name, tokens, stream)
+                    return self._run(request_fn, model_name, stream=stream)
+                except Exception as e:
+                    last_error = e
+                    status = error_status(e)
+                    with self._stats_lock:
+                        self.stats['errors'][status] = self.stats['errors'].get(status, 0) + 1
+                    if status in FAILOVER_STATUS:
+                        break
+                    if status not in RETRYABLE_STATUS:
+                        raise
+                    if attempt + 1 < self.max_attempts:
+                        self._count('retries')
+                        instrumentation.count('gemini.api_retries', status=status)
+                        self._sleep(self.backoff_delay(attempt))
+        raise last_error
+
+    def close(self):
+        if self._hedge_pool:
+            self._hedge_pool.shutdown(wait=False)
@@ -0,0 +1,120 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+def normalize_prompt(prompt):
+    """Collapse whitespace so prompts differing only in spacing share a cache entry; case can change the output"""
+    return re.sub(r'\s+', ' ', str(prompt)).strip()
+
+def make_cache_key(prompt, model_name, template_version, structured=False):
+    """Key for a prompt's response; structured (schema-constrained) and free-form responses are kept apart"""
+    mode = 'structured' if structured else 'text'
+    payload = '\x1f'.join([normalize_prompt(prompt), str(model_name), str(template_version), mode])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class ResponseCache:
+    """Two-tier cache of parsed Gemini responses keyed by make_cache_key.
+
+    An in-memory LRU sits in front of an optional SQLite file. Both tiers honour
+    the same TTL and evict least-recently-used entries past their size limit.
+    Values are stored as JSON text so every hit hands back an independent dict.
+    """
+
+    def __init__(self, db_path=None, max_memory_entries=1024, max_disk_entries=100000, ttl_seconds=7 * 24 * 3600):
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self.ttl_seconds = ttl_seconds
+        self.stats = {'hits': 0, 'misses': 0, 'memory_hits': 0, 'disk_hits': 0, 'evictions': 0}
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if db_path:
+            db_dir = os.path.dirname(os.path.abspath(db_path))
+            os.makedirs(db_dir, exist_ok=True)
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute('CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)')
+            self._db.execute('CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)')
+            self._purge_expired_disk(time.time())
+            self._disk_count = self._db.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+
+    def _expired(self, created, now):
+        return self.ttl_seconds is not None and now - created > self.ttl_seconds
+
+    def _purge_expired_disk(self, now):
+        if self.ttl_seconds is not None:
+            self._db.execute('DELETE FROM responses WHERE created < ?', (now - self.ttl_seconds,))
+        self._db.commit()
+
+    def _remember(self, key, value, created):
+        self._memory[key] = (value, created)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+            self.stats['evictions'] += 1
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if not self._expired(entry[1], now):
+                    self._memory.move_to_end(key)
+                    self.stats['hits'] += 1
+                    self.stats['memory_hits'] += 1
+                    return json.loads(entry[0])
+                del self._memory[key]
+
+            if self._db is not None:
+                row = self._db.execute('SELECT value, created FROM responses WHERE key = ?', (key,)).fetchone()
+                if row is not None:
+                    value, created = row
+                    if not self._expired(created, now):
+                        self._db.execute('UPDATE responses SET accessed = ? WHERE key = ?', (now, key))
+                        self._db.commit()
+                        self._remember(key, value, created)
+                        self.stats['hits'] += 1
+                        self.stats['disk_hits'] += 1
+                        return json.loads(value)
+                    self._db.execute('DELETE FROM responses WHERE key = ?', (key,))
+                    self._db.commit()
+                    self._disk_count -= 1
+
+            self.stats['misses'] += 1
+            return None
+
+    def set(self, key, job_data):
+        value = json.dumps(job_data, ensure_ascii=False)
+        now = time.time()
+        with self._lock:
+            self._remember(key, value, now)
+            if self._db is None:
+                return
+            existed = self._db.execute('SELECT 1 FROM responses WHERE key = ?', (key,)).fetchone() is not None
+            self._db.execute('INSERT OR REPLACE INTO responses (key, value, created, accessed) VALUES (?, ?, ?, ?)', (key, value, now, now))
+            if not existed:
+                self._disk_count += 1
+            if self._disk_count > self.max_disk_entries:
+                overflow = self._disk_count - self.max_disk_entries
+                self._db.execute('DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY accessed LIMIT ?)', (overflow,))
+                self._disk_count -= overflow
+                self.stats['evictions'] += overflow
+            self._db.commit()
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute('DELETE FROM responses')
+                self._db.commit()
+                self._disk_count = 0
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None